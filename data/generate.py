@@ -9,15 +9,41 @@ causing cascading failures across payment-service and notification-service.
 Usage:
     python generate.py                    # Generate all data
     python generate.py --output ../data/sample  # Custom output directory
+    python generate.py --compress gzip    # Write .ndjson.gz files
 """
 
 import argparse
+import binascii
+import gzip
 import json
 import os
-import random
-import uuid
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # only needed for --compress zstd
+    zstandard = None
+ZSTD_MISSING = "--compress zstd requires the zstandard package (pip install zstandard)"
+
+# Numba is optional: kernels are compiled (and cached on disk) when it is
+# installed, and run as plain Python/NumPy otherwise (e.g. on PyPy).
+try:
+    from numba import njit, prange
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+    prange = range
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -46,6 +72,14 @@ REQUEST_PATHS = {
     "api-gateway": ["/api/v1/orders", "/api/v1/payments", "/api/v1/users", "/api/v1/notifications", "/healthz"],
 }
 
+# Flattened host/path tables in SERVICES order, for bulk index lookups
+N_HOSTS = np.array([len(HOSTS[s]) for s in SERVICES])
+N_PATHS = np.array([len(REQUEST_PATHS[s]) for s in SERVICES])
+HOST_OFFSETS = np.concatenate(([0], np.cumsum(N_HOSTS)[:-1]))
+PATH_OFFSETS = np.concatenate(([0], np.cumsum(N_PATHS)[:-1]))
+HOST_NAMES = np.array([h for s in SERVICES for h in HOSTS[s]], dtype=object)
+PATH_NAMES = np.array([p for s in SERVICES for p in REQUEST_PATHS[s]], dtype=object)
+
 # Timeline: 2 hours of data
 # T+0 to T+58: Normal operation
 # T+58: Bad deployment
@@ -68,15 +102,27 @@ RESOLVED_MIN = 90
 DEPLOYERS = ["alice.chen", "bob.kumar", "carol.okonkwo", "david.miller", "eve.nakamura"]
 
 
-def ts(base: datetime, offset_minutes: float) -> str:
-    """Return ISO timestamp string offset from base."""
-    dt = base + timedelta(minutes=offset_minutes)
-    return dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+SECOND_SUFFIXES = [f"{sec:02d}.000Z" for sec in range(60)]
 
 
-def jitter(value: float, pct: float = 0.1) -> float:
-    """Add random jitter to a value."""
-    return value * (1 + random.uniform(-pct, pct))
+def to_json(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def ts_minute(base: datetime, minute: int) -> str:
+    """Return ISO timestamp string for a whole-minute offset from base."""
+    return (base + timedelta(minutes=minute)).strftime("%Y-%m-%dT%H:%M:00.000Z")
+
+
+def minute_prefixes(base: datetime) -> list[str]:
+    """Return the "YYYY-MM-DDTHH:MM:" prefix of every minute in the timeline.
+
+    Callers append the seconds part, so base should be aligned to a whole minute.
+    """
+    return [(base + timedelta(minutes=m)).strftime("%Y-%m-%dT%H:%M:") for m in range(TOTAL_MINUTES)]
 
 
 # ---------------------------------------------------------------------------
@@ -154,117 +200,137 @@ INCIDENT_ERROR_MESSAGES_GATEWAY = [
     ("error", "Request timeout on /api/v1/orders after 60s", "GATEWAY_TIMEOUT"),
 ]
 
+# Incident error tables by service; user-service is unaffected by the incident
+INCIDENT_ERROR_MESSAGES = {
+    "order-service": INCIDENT_ERROR_MESSAGES_ORDER,
+    "payment-service": INCIDENT_ERROR_MESSAGES_PAYMENT,
+    "notification-service": INCIDENT_ERROR_MESSAGES_NOTIF,
+    "api-gateway": INCIDENT_ERROR_MESSAGES_GATEWAY,
+}
 
-def generate_logs(base_time: datetime) -> list[dict]:
-    """Generate application log documents."""
-    logs = []
-
-    for minute in range(TOTAL_MINUTES):
-        t = minute  # offset in minutes
-
-        for service in SERVICES:
-            # Determine how many logs per minute for this service
-            if t < INCIDENT_START_MIN or t >= RESOLVED_MIN:
-                # Normal operation: 2-5 logs per minute per service
-                count = random.randint(2, 5)
-                error_ratio = 0.0
-            elif INCIDENT_START_MIN <= t < INCIDENT_PEAK_MIN:
-                # Incident ramping up
-                progress = (t - INCIDENT_START_MIN) / (INCIDENT_PEAK_MIN - INCIDENT_START_MIN)
-                if service == "order-service":
-                    count = random.randint(5, 15)
-                    error_ratio = progress * 0.7
-                elif service in ("payment-service", "notification-service"):
-                    count = random.randint(3, 8)
-                    error_ratio = progress * 0.3
-                elif service == "api-gateway":
-                    count = random.randint(3, 7)
-                    error_ratio = progress * 0.2
-                else:
-                    count = random.randint(2, 5)
-                    error_ratio = 0.0
-            elif INCIDENT_PEAK_MIN <= t < ROLLBACK_MIN:
-                # Peak incident
-                if service == "order-service":
-                    count = random.randint(15, 30)
-                    error_ratio = 0.8
-                elif service == "payment-service":
-                    count = random.randint(8, 15)
-                    error_ratio = 0.5
-                elif service == "notification-service":
-                    count = random.randint(6, 12)
-                    error_ratio = 0.4
-                elif service == "api-gateway":
-                    count = random.randint(5, 10)
-                    error_ratio = 0.3
-                else:
-                    count = random.randint(2, 5)
-                    error_ratio = 0.0
-            elif ROLLBACK_MIN <= t < RECOVERY_MIN:
-                # Rollback deployed, still some errors
-                if service == "order-service":
-                    count = random.randint(8, 15)
-                    error_ratio = 0.3
-                elif service in ("payment-service", "notification-service"):
-                    count = random.randint(4, 8)
-                    error_ratio = 0.15
-                else:
-                    count = random.randint(2, 5)
-                    error_ratio = 0.02
-            else:
-                # RECOVERY_MIN <= t < RESOLVED_MIN: recovering
-                progress = (t - RECOVERY_MIN) / (RESOLVED_MIN - RECOVERY_MIN)
-                if service == "order-service":
-                    count = random.randint(3, 8)
-                    error_ratio = 0.3 * (1 - progress)
-                elif service in ("payment-service", "notification-service"):
-                    count = random.randint(2, 5)
-                    error_ratio = 0.15 * (1 - progress)
-                else:
-                    count = random.randint(2, 5)
-                    error_ratio = 0.0
-
-            for i in range(count):
-                second_offset = random.uniform(0, 59)
-                trace_id = str(uuid.uuid4())[:8]
-                host = random.choice(HOSTS[service])
-                path = random.choice(REQUEST_PATHS[service])
-
-                is_error = random.random() < error_ratio
-
-                if is_error:
-                    # Pick an error message based on service
-                    if service == "order-service":
-                        level, message, error_code = random.choice(INCIDENT_ERROR_MESSAGES_ORDER)
-                    elif service == "payment-service":
-                        level, message, error_code = random.choice(INCIDENT_ERROR_MESSAGES_PAYMENT)
-                    elif service == "notification-service":
-                        level, message, error_code = random.choice(INCIDENT_ERROR_MESSAGES_NOTIF)
-                    elif service == "api-gateway":
-                        level, message, error_code = random.choice(INCIDENT_ERROR_MESSAGES_GATEWAY)
-                    else:
-                        continue
-                    response_time = random.randint(5000, 30000) if "timeout" in message.lower() else random.randint(500, 5000)
-                else:
-                    level, message, error_code = random.choice(NORMAL_LOG_MESSAGES[service])
-                    message = message.replace("{trace_id}", trace_id)
-                    response_time = random.randint(10, 300)
-
-                log = {
-                    "@timestamp": ts(base_time, t + second_offset / 60),
-                    "level": level,
-                    "service": service,
-                    "message": message,
-                    "trace_id": f"trace-{trace_id}",
-                    "host": host,
-                    "request_path": path,
-                    "response_time_ms": response_time,
-                }
-                if error_code:
-                    log["error_code"] = error_code
-                logs.append(log)
-
-    return logs
+
+def generate_logs(base_time: datetime, rng: np.random.Generator) -> Iterator[bytes]:
+    """Generate application log documents as pre-serialized JSON lines.
+
+    The per-minute schedule (log count and error ratio for every minute/service
+    pair) is computed up front with NumPy masks, and every per-record random
+    draw is taken in bulk, so the Python loop at the end only fills in a
+    fixed JSON template.
+    """
+    n_services = len(SERVICES)
+    t = np.arange(TOTAL_MINUTES)
+
+    ramp = (INCIDENT_START_MIN <= t) & (t < INCIDENT_PEAK_MIN)
+    peak = (INCIDENT_PEAK_MIN <= t) & (t < ROLLBACK_MIN)
+    rollback = (ROLLBACK_MIN <= t) & (t < RECOVERY_MIN)
+    recovery = (RECOVERY_MIN <= t) & (t < RESOLVED_MIN)
+    ramp_progress = (t - INCIDENT_START_MIN) / (INCIDENT_PEAK_MIN - INCIDENT_START_MIN)
+    recovery_progress = (t - RECOVERY_MIN) / (RESOLVED_MIN - RECOVERY_MIN)
+
+    # Normal operation: 2-5 logs per minute per service, no errors
+    low = np.full((TOTAL_MINUTES, n_services), 2)
+    high = np.full((TOTAL_MINUTES, n_services), 5)
+    error_ratio = np.zeros((TOTAL_MINUTES, n_services))
+
+    def regime(mask, services, lo, hi, ratio):
+        for service in services:
+            col = SERVICES.index(service)
+            low[mask, col] = lo
+            high[mask, col] = hi
+            error_ratio[mask, col] = np.broadcast_to(ratio, t.shape)[mask]
+
+    # Incident ramping up
+    regime(ramp, ["order-service"], 5, 15, ramp_progress * 0.7)
+    regime(ramp, ["payment-service", "notification-service"], 3, 8, ramp_progress * 0.3)
+    regime(ramp, ["api-gateway"], 3, 7, ramp_progress * 0.2)
+    # Peak incident
+    regime(peak, ["order-service"], 15, 30, 0.8)
+    regime(peak, ["payment-service"], 8, 15, 0.5)
+    regime(peak, ["notification-service"], 6, 12, 0.4)
+    regime(peak, ["api-gateway"], 5, 10, 0.3)
+    # Rollback deployed, still some errors
+    regime(rollback, ["order-service"], 8, 15, 0.3)
+    regime(rollback, ["payment-service", "notification-service"], 4, 8, 0.15)
+    regime(rollback, ["user-service", "api-gateway"], 2, 5, 0.02)
+    # Recovering
+    regime(recovery, ["order-service"], 3, 8, 0.3 * (1 - recovery_progress))
+    regime(recovery, ["payment-service", "notification-service"], 2, 5, 0.15 * (1 - recovery_progress))
+
+    counts = rng.integers(low, high + 1)
+
+    # Flatten the schedule into one row per log record (minute-major, then service)
+    flat_counts = counts.ravel()
+    total = int(flat_counts.sum())
+    minute_idx = np.repeat(np.repeat(t, n_services), flat_counts)
+    svc_idx = np.repeat(np.tile(np.arange(n_services), TOTAL_MINUTES), flat_counts)
+
+    error_tables = [INCIDENT_ERROR_MESSAGES.get(s, []) for s in SERVICES]
+    n_normal = np.array([len(NORMAL_LOG_MESSAGES[s]) for s in SERVICES])
+    n_errors = np.array([max(len(tbl), 1) for tbl in error_tables])
+
+    second_offsets = rng.uniform(0, 59, total)
+    is_error = rng.random(total) < np.repeat(error_ratio.ravel(), flat_counts)
+    host_idx = rng.integers(0, N_HOSTS[svc_idx])
+    path_idx = rng.integers(0, N_PATHS[svc_idx])
+    normal_idx = rng.integers(0, n_normal[svc_idx])
+    error_idx = rng.integers(0, n_errors[svc_idx])
+    timeout_ms = rng.integers(5000, 30001, total)
+    failure_ms = rng.integers(500, 5001, total)
+    normal_ms = rng.integers(10, 301, total)
+
+    # Flat message catalog: each service's normal messages followed by its
+    # incident errors, so every record's message is a single index.
+    catalog = []
+    catalog_services = []
+    normal_offset = np.zeros(n_services, dtype=np.int64)
+    error_offset = np.zeros(n_services, dtype=np.int64)
+    for s, service in enumerate(SERVICES):
+        normal_offset[s] = len(catalog)
+        catalog.extend(NORMAL_LOG_MESSAGES[service])
+        error_offset[s] = len(catalog)
+        catalog.extend(error_tables[s])
+        catalog_services.extend([service] * (len(catalog) - normal_offset[s]))
+    msg_idx = np.where(is_error, error_offset[svc_idx] + error_idx, normal_offset[svc_idx] + normal_idx)
+
+    # Timeout errors take 5-30s, other errors 0.5-5s; flag timeouts once per message
+    is_timeout = np.array(["timeout" in message.lower() for _, message, _ in catalog])
+    response_ms = np.where(is_error, np.where(is_timeout[msg_idx], timeout_ms, failure_ms), normal_ms).astype(np.int32)
+
+    # Resolve host and path names with one fancy-index into flat name tables
+    hosts = HOST_NAMES[HOST_OFFSETS[svc_idx] + host_idx]
+    paths = PATH_NAMES[PATH_OFFSETS[svc_idx] + path_idx]
+
+    # Services without an incident error table drop their error records
+    keep = ~is_error | (np.array([len(tbl) for tbl in error_tables])[svc_idx] > 0)
+    # Numeric columns stay unboxed; response times are formatted to text by
+    # NumPy, so no Python ints are created for them.
+    columns = [
+        col[keep].tolist()
+        for col in (minute_idx, second_offsets.astype(np.int32), msg_idx, hosts, paths, response_ms.astype(str))
+    ]
+    total = int(keep.sum())
+
+    # One 8-char hex trace id per record, sliced out of a single random buffer
+    hexids = binascii.hexlify(rng.bytes(4 * total)).decode()
+    minute_prefix = minute_prefixes(base_time)
+
+    # Pre-serialized JSON fragments per catalog entry: the level/service/message
+    # fields and the closing error_code (if any). Messages are escaped once here;
+    # hosts, paths and ids are plain identifiers and need no escaping.
+    heads = [
+        f'"level":"{level}","service":"{service}","message":{to_json(message).decode()},'
+        for service, (level, message, _) in zip(catalog_services, catalog)
+    ]
+    tails = [f',"error_code":"{code}"}}\n' if code else "}\n" for _, _, code in catalog]
+    templated = ["{trace_id}" in message for _, message, _ in catalog]
+
+    for i, (minute, sec, m, host, path, response_time) in enumerate(zip(*columns)):
+        trace_id = hexids[i * 8:(i + 1) * 8]
+        head = heads[m].replace("{trace_id}", trace_id) if templated[m] else heads[m]
+        yield (
+            f'{{"@timestamp":"{minute_prefix[minute]}{SECOND_SUFFIXES[sec]}",{head}"trace_id":"trace-{trace_id}",'
+            f'"host":"{host}","request_path":"{path}","response_time_ms":{response_time}{tails[m]}'
+        ).encode()
 
 
 # ---------------------------------------------------------------------------
@@ -280,102 +346,120 @@ BASELINE_METRICS = {
 }
 
 
-def get_incident_multipliers(service: str, minute: int) -> dict:
-    """Return metric multipliers based on incident timeline."""
-    if minute < INCIDENT_START_MIN or minute >= RESOLVED_MIN:
-        return {"cpu": 1, "mem": 1, "latency": 1, "error_rate": 1, "rps": 1, "conns": 1}
-
-    if service == "user-service":
-        return {"cpu": 1, "mem": 1, "latency": 1, "error_rate": 1, "rps": 1, "conns": 1}
-
-    if INCIDENT_START_MIN <= minute < INCIDENT_PEAK_MIN:
-        progress = (minute - INCIDENT_START_MIN) / (INCIDENT_PEAK_MIN - INCIDENT_START_MIN)
-    elif INCIDENT_PEAK_MIN <= minute < ROLLBACK_MIN:
-        progress = 1.0
-    elif ROLLBACK_MIN <= minute < RECOVERY_MIN:
-        progress = 1.0 - 0.5 * ((minute - ROLLBACK_MIN) / (RECOVERY_MIN - ROLLBACK_MIN))
-    else:  # RECOVERY_MIN <= minute < RESOLVED_MIN
-        progress = 0.5 * (1.0 - (minute - RECOVERY_MIN) / (RESOLVED_MIN - RECOVERY_MIN))
-
-    if service == "order-service":
-        return {
-            "cpu": 1 + progress * 1.5,
-            "mem": 1 + progress * 0.4,
-            "latency": 1 + progress * 20,
-            "error_rate": 1 + progress * 220,  # 0.002 * 220 = 0.44 peak
-            "rps": 1 - progress * 0.3,
-            "conns": 1 + progress * 1.5,
-        }
-    elif service == "payment-service":
-        delayed = max(0, progress - 0.3) / 0.7 if progress > 0.3 else 0
-        return {
-            "cpu": 1 + delayed * 0.8,
-            "mem": 1 + delayed * 0.2,
-            "latency": 1 + delayed * 12,
-            "error_rate": 1 + delayed * 150,
-            "rps": 1 - delayed * 0.2,
-            "conns": 1 + delayed * 0.8,
-        }
-    elif service == "notification-service":
-        delayed = max(0, progress - 0.5) / 0.5 if progress > 0.5 else 0
-        return {
-            "cpu": 1 + delayed * 0.6,
-            "mem": 1 + delayed * 0.3,
-            "latency": 1 + delayed * 8,
-            "error_rate": 1 + delayed * 100,
-            "rps": 1 - delayed * 0.15,
-            "conns": 1 + delayed * 0.6,
-        }
-    elif service == "api-gateway":
-        return {
-            "cpu": 1 + progress * 0.5,
-            "mem": 1 + progress * 0.1,
-            "latency": 1 + progress * 5,
-            "error_rate": 1 + progress * 80,
-            "rps": 1 + progress * 0.2,  # more retries = more requests
-            "conns": 1 + progress * 0.4,
-        }
-
-    return {"cpu": 1, "mem": 1, "latency": 1, "error_rate": 1, "rps": 1, "conns": 1}
-
+METRIC_FIELDS = ("cpu", "mem", "latency", "error_rate", "rps", "conns")
+METRIC_JITTER = np.array([0.05, 0.03, 0.1, 0.05, 0.08, 0.1])  # +/- fraction, per METRIC_FIELDS
 
-def generate_metrics(base_time: datetime) -> list[dict]:
-    """Generate service health metric documents (one per service per minute)."""
-    metrics = []
-
-    for minute in range(TOTAL_MINUTES):
-        for service in SERVICES:
-            base = BASELINE_METRICS[service]
-            mult = get_incident_multipliers(service, minute)
+# Per-service incident impact: (onset, per-metric slope). A service only starts
+# degrading once the incident progress exceeds its onset, which models the
+# cascade from order-service to its dependents.
+INCIDENT_IMPACT = {
+    "order-service": (0.0, {"cpu": 1.5, "mem": 0.4, "latency": 20, "error_rate": 220, "rps": -0.3, "conns": 1.5}),  # 0.002 * 220 = 0.44 peak
+    "payment-service": (0.3, {"cpu": 0.8, "mem": 0.2, "latency": 12, "error_rate": 150, "rps": -0.2, "conns": 0.8}),
+    "notification-service": (0.5, {"cpu": 0.6, "mem": 0.3, "latency": 8, "error_rate": 100, "rps": -0.15, "conns": 0.6}),
+    "user-service": (0.0, {"cpu": 0, "mem": 0, "latency": 0, "error_rate": 0, "rps": 0, "conns": 0}),
+    "api-gateway": (0.0, {"cpu": 0.5, "mem": 0.1, "latency": 5, "error_rate": 80, "rps": 0.2, "conns": 0.4}),  # more retries = more requests
+}
 
-            for host in HOSTS[service]:
-                error_rate = min(base["error_rate"] * mult["error_rate"], 0.95)
-                cpu = min(base["cpu"] * mult["cpu"], 98)
-                mem = min(base["mem"] * mult["mem"], 95)
-                latency = base["latency"] * mult["latency"]
-                rps = max(base["rps"] * mult["rps"] / len(HOSTS[service]), 10)
-                conns = int(base["conns"] * mult["conns"] / len(HOSTS[service]))
 
-                metrics.append({
-                    "@timestamp": ts(base_time, minute),
-                    "service": service,
-                    "host": host,
-                    "cpu_percent": round(jitter(cpu, 0.05), 1),
-                    "memory_percent": round(jitter(mem, 0.03), 1),
-                    "request_latency_ms": round(jitter(latency, 0.1), 1),
-                    "error_rate": round(jitter(error_rate, 0.05), 4),
-                    "requests_per_second": round(jitter(rps, 0.08), 1),
-                    "active_connections": max(1, int(jitter(conns, 0.1))),
-                })
+def incident_progress(minutes: np.ndarray) -> np.ndarray:
+    """Return incident severity in [0, 1] for each minute of the timeline."""
+    ramp = (INCIDENT_START_MIN <= minutes) & (minutes < INCIDENT_PEAK_MIN)
+    peak = (INCIDENT_PEAK_MIN <= minutes) & (minutes < ROLLBACK_MIN)
+    rollback = (ROLLBACK_MIN <= minutes) & (minutes < RECOVERY_MIN)
+    recovery = (RECOVERY_MIN <= minutes) & (minutes < RESOLVED_MIN)
+    return np.where(ramp, (minutes - INCIDENT_START_MIN) / (INCIDENT_PEAK_MIN - INCIDENT_START_MIN),
+           np.where(peak, 1.0,
+           np.where(rollback, 1.0 - 0.5 * (minutes - ROLLBACK_MIN) / (RECOVERY_MIN - ROLLBACK_MIN),
+           np.where(recovery, 0.5 * (1.0 - (minutes - RECOVERY_MIN) / (RESOLVED_MIN - RECOVERY_MIN)),
+                    0.0))))
+
+
+# No fastmath here: the multipliers feed truncated connection counts, and
+# reassociated float math would make JIT and pure-Python output diverge.
+@njit(cache=True, boundscheck=False)
+def _multiplier_kernel(out, progress, onset, slopes):
+    n_minutes, n_services, n_metrics = out.shape
+    for minute in range(n_minutes):
+        for s in range(n_services):
+            delayed = max(0.0, progress[minute] - onset[s]) / (1.0 - onset[s])
+            for k in range(n_metrics):
+                out[minute, s, k] = 1.0 + delayed * slopes[s, k]
+
+
+def incident_multipliers() -> np.ndarray:
+    """Return metric multipliers for the incident timeline.
+
+    The result has shape (TOTAL_MINUTES, len(SERVICES), len(METRIC_FIELDS)).
+    """
+    progress = incident_progress(np.arange(TOTAL_MINUTES))
+    onset = np.array([INCIDENT_IMPACT[s][0] for s in SERVICES])
+    slopes = np.array([[INCIDENT_IMPACT[s][1][f] for f in METRIC_FIELDS] for s in SERVICES], dtype=np.float64)
+    out = np.empty((TOTAL_MINUTES, len(SERVICES), len(METRIC_FIELDS)))
+    _multiplier_kernel(out, progress, onset, slopes)
+    return out
+
+
+# No fastmath here either: the conns column is truncated to an integer.
+@njit(cache=True, boundscheck=False, parallel=True)
+def _metrics_kernel(out, base, mult, n_hosts, host_offset):
+    n_minutes, n_services, _ = mult.shape
+    hosts_per_minute = n_hosts.sum()
+    for minute in prange(n_minutes):
+        for s in range(n_services):
+            for h in range(n_hosts[s]):
+                row = minute * hosts_per_minute + host_offset[s] + h
+                out[row, 0] = min(base[s, 0] * mult[minute, s, 0], 98.0)
+                out[row, 1] = min(base[s, 1] * mult[minute, s, 1], 95.0)
+                out[row, 2] = base[s, 2] * mult[minute, s, 2]
+                out[row, 3] = min(base[s, 3] * mult[minute, s, 3], 0.95)
+                out[row, 4] = max(base[s, 4] * mult[minute, s, 4] / n_hosts[s], 10.0)
+                out[row, 5] = np.trunc(base[s, 5] * mult[minute, s, 5] / n_hosts[s])
+
+
+def generate_metrics(base_time: datetime, rng: np.random.Generator) -> Iterator[bytes]:
+    """Generate service health metrics (one per host per minute) as pre-serialized JSON lines."""
+    # Metric timestamps only depend on the minute, so format each one once
+    timestamps = [ts_minute(base_time, m) for m in range(TOTAL_MINUTES)]
+
+    # Metric values for every (minute, service, host) row, in METRIC_FIELDS
+    # column order, with jitter and rounding applied to whole columns
+    base = np.array([[BASELINE_METRICS[s][f] for f in METRIC_FIELDS] for s in SERVICES], dtype=np.float64)
+    values = np.empty((TOTAL_MINUTES * len(HOST_NAMES), len(METRIC_FIELDS)))
+    _metrics_kernel(values, base, incident_multipliers(), N_HOSTS, HOST_OFFSETS)
+    values *= 1 + rng.uniform(-METRIC_JITTER, METRIC_JITTER, values.shape)
+    rows = zip(
+        np.round(values[:, 0], 1).tolist(),
+        np.round(values[:, 1], 1).tolist(),
+        np.round(values[:, 2], 1).tolist(),
+        np.round(values[:, 3], 4).tolist(),
+        np.round(values[:, 4], 1).tolist(),
+        np.maximum(1, values[:, 5].astype(np.int32)).tolist(),
+    )
+
+    # The schema is fixed, so the service/host part of each line is built once
+    # per host. Rounded floats never reach exponent notation, so str() renders
+    # them exactly as the JSON encoders do.
+    host_fields = [
+        f'","service":"{service}","host":"{host}","cpu_percent":'
+        for service in SERVICES
+        for host in HOSTS[service]
+    ]
 
-    return metrics
+    for timestamp in timestamps:
+        for host_field in host_fields:
+            cpu, mem, latency, error_rate, rps, conns = next(rows)
+            yield (
+                f'{{"@timestamp":"{timestamp}{host_field}{cpu},"memory_percent":{mem},'
+                f'"request_latency_ms":{latency},"error_rate":{error_rate},'
+                f'"requests_per_second":{rps},"active_connections":{conns}}}\n'
+            ).encode()
 
 
 # ---------------------------------------------------------------------------
 # Deployment Generation
 # ---------------------------------------------------------------------------
 
-def generate_deployments(base_time: datetime) -> list[dict]:
+def generate_deployments(base_time: datetime, rng: np.random.Generator) -> list[dict]:
     """Generate deployment history documents."""
     deployments = []
 
@@ -388,20 +472,23 @@ def generate_deployments(base_time: datetime) -> list[dict]:
         (-360, "order-service", "2.3.9", "Performance optimization for bulk order queries"),
     ]
 
-    for offset, service, version, changes in historical:
+    # 7-char commit hashes for all historical deployments from one random buffer
+    hashes = rng.bytes(4 * len(historical)).hex()
+
+    for i, (offset, service, version, changes) in enumerate(historical):
         deployments.append({
-            "@timestamp": ts(base_time, offset),
+            "@timestamp": ts_minute(base_time, offset),
             "service": service,
             "version": version,
-            "deployer": random.choice(DEPLOYERS),
+            "deployer": DEPLOYERS[rng.integers(len(DEPLOYERS))],
             "status": "success",
-            "commit_hash": uuid.uuid4().hex[:7],
+            "commit_hash": hashes[i * 8:i * 8 + 7],
             "changes": changes,
         })
 
     # The bad deployment: order-service v2.4.1
     deployments.append({
-        "@timestamp": ts(base_time, 58),
+        "@timestamp": ts_minute(base_time, 58),
         "service": "order-service",
         "version": "2.4.1",
         "deployer": "bob.kumar",
@@ -412,7 +499,7 @@ def generate_deployments(base_time: datetime) -> list[dict]:
 
     # The rollback deployment
     deployments.append({
-        "@timestamp": ts(base_time, ROLLBACK_MIN),
+        "@timestamp": ts_minute(base_time, ROLLBACK_MIN),
         "service": "order-service",
         "version": "2.3.9",
         "deployer": "alice.chen",
@@ -519,7 +606,7 @@ def generate_runbooks() -> list[dict]:
 # Alert Generation
 # ---------------------------------------------------------------------------
 
-def generate_alerts(base_time: datetime) -> list[dict]:
+def generate_alerts(base_time: datetime, rng: np.random.Generator) -> list[dict]:
     """Generate alert documents."""
     alerts = []
 
@@ -530,10 +617,12 @@ def generate_alerts(base_time: datetime) -> list[dict]:
         (-360, "low", "notification-service", "Queue depth above 200", 200, 215, "resolved"),
     ]
 
-    for offset, severity, service, message, threshold, actual, status in historical_alerts:
+    alert_ids = rng.bytes(4 * len(historical_alerts)).hex()
+
+    for i, (offset, severity, service, message, threshold, actual, status) in enumerate(historical_alerts):
         alerts.append({
-            "@timestamp": ts(base_time, offset),
-            "alert_id": f"ALT-{uuid.uuid4().hex[:8]}",
+            "@timestamp": ts_minute(base_time, offset),
+            "alert_id": f"ALT-{alert_ids[i * 8:(i + 1) * 8]}",
             "severity": severity,
             "service": service,
             "condition": f"{message.split(' above ')[0]} above threshold",
@@ -545,7 +634,7 @@ def generate_alerts(base_time: datetime) -> list[dict]:
 
     # The critical incident alert
     alerts.append({
-        "@timestamp": ts(base_time, ALERT_FIRE_MIN),
+        "@timestamp": ts_minute(base_time, ALERT_FIRE_MIN),
         "alert_id": "ALT-CRITICAL-001",
         "severity": "critical",
         "service": "order-service",
@@ -558,7 +647,7 @@ def generate_alerts(base_time: datetime) -> list[dict]:
 
     # Cascading alert for payment-service
     alerts.append({
-        "@timestamp": ts(base_time, ALERT_FIRE_MIN + 2),
+        "@timestamp": ts_minute(base_time, ALERT_FIRE_MIN + 2),
         "alert_id": "ALT-HIGH-002",
         "severity": "high",
         "service": "payment-service",
@@ -576,21 +665,89 @@ def generate_alerts(base_time: datetime) -> list[dict]:
 # NDJSON Writer
 # ---------------------------------------------------------------------------
 
-def write_ndjson(docs: list[dict], filepath: str, index_name: str):
-    """Write documents as NDJSON (newline-delimited JSON) for Elasticsearch bulk API."""
+# Serialized docs are collected in memory and handed to the OS in one write;
+# this only bounds memory for very large outputs
+WRITE_BUFFER_BYTES = 64 << 20
+
+# --compress choice -> file name suffix
+COMPRESS_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def open_output(filepath: str, compress: str = "none"):
+    """Open filepath for binary writing, optionally through a compressor.
+
+    Level 1 gzip / level 3 zstd keep compression cheap relative to generation;
+    NDJSON still shrinks several times over.
+    """
+    if compress == "gzip":
+        return gzip.open(filepath, "wb", compresslevel=1)
+    if compress == "zstd":
+        if zstandard is None:
+            raise RuntimeError(ZSTD_MISSING)
+        return zstandard.ZstdCompressor(level=3).stream_writer(open(filepath, "wb"), write_return_read=True)
+    # Unbuffered: each write goes straight to os.write with no extra copy
+    return open(filepath, "wb", buffering=0)
+
+
+def write_all(f, data: bytearray) -> None:
+    """Write all of data to f, resuming after short writes on unbuffered files."""
+    view = memoryview(data)
+    while view:
+        view = view[f.write(view):]
+
+
+def write_ndjson(docs: Iterable[dict | bytes], filepath: str, index_name: str, compress: str = "none") -> int:
+    """Write documents as NDJSON (newline-delimited JSON) for Elasticsearch bulk API.
+
+    Documents may be dicts or already-serialized JSON lines (bytes ending in a
+    newline). With compress, the file is written gzip/zstd-compressed and the
+    matching suffix is appended to filepath. Returns the number of documents written.
+    """
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    with open(filepath, "w", encoding="utf-8") as f:
+    filepath += COMPRESS_SUFFIXES[compress]
+    action = to_json({"index": {"_index": index_name}}) + b"\n"
+    out = bytearray()
+    count = 0
+    with open_output(filepath, compress) as f:
         for doc in docs:
-            action = json.dumps({"index": {"_index": index_name}})
-            data = json.dumps(doc, ensure_ascii=False)
-            f.write(f"{action}\n{data}\n")
-    print(f"  Written {len(docs):,} docs to {filepath}")
+            out += action
+            if isinstance(doc, bytes):
+                out += doc
+            else:
+                out += to_json(doc)
+                out += b"\n"
+            count += 1
+            if len(out) >= WRITE_BUFFER_BYTES:
+                write_all(f, out)
+                out.clear()
+        write_all(f, out)
+    print(f"  Written {count:,} docs to {filepath}")
+    return count
 
 
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
+# Output file name -> (generator(base_time, rng), target index)
+GENERATORS = {
+    "logs": (generate_logs, "resolve-logs"),
+    "metrics": (generate_metrics, "resolve-metrics"),
+    "deployments": (generate_deployments, "resolve-deployments"),
+    "runbooks": (lambda base_time, rng: generate_runbooks(), "resolve-runbooks"),
+    "alerts": (generate_alerts, "resolve-alerts"),
+}
+
+
+def _generate_to_file(
+    name: str, base_time: datetime, seed: np.random.SeedSequence, output: str, compress: str
+) -> int:
+    """Run one generator and write its NDJSON file (process pool worker)."""
+    generate, index_name = GENERATORS[name]
+    docs = generate(base_time, np.random.default_rng(seed))
+    return write_ndjson(docs, os.path.join(output, f"{name}.ndjson"), index_name, compress)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate synthetic data for Resolve")
     parser.add_argument("--output", default=os.path.join(os.path.dirname(__file__), "sample"),
@@ -599,56 +756,55 @@ def main():
                         help="Base time in ISO format (default: 2 hours ago)")
     parser.add_argument("--seed", type=int, default=42,
                         help="Random seed for reproducibility")
+    parser.add_argument("--compress", choices=list(COMPRESS_SUFFIXES), default="none",
+                        help="Compress output files (default: none; setup/02_ingest_data.sh "
+                             "expects plain .ndjson)")
     args = parser.parse_args()
-
-    random.seed(args.seed)
+    # Checked up front: inside the pool, a worker's RuntimeError could not be
+    # told apart from other failures
+    if args.compress == "zstd" and zstandard is None:
+        parser.error(ZSTD_MISSING)
 
     if args.base_time:
         base_time = datetime.fromisoformat(args.base_time).replace(tzinfo=timezone.utc)
     else:
         base_time = datetime.now(timezone.utc) - timedelta(hours=2)
+    # Align to a whole minute so per-minute timestamp prefixes can be reused
+    base_time = base_time.replace(second=0, microsecond=0)
 
     print(f"Resolve - Synthetic Data Generator")
     print(f"Base time: {base_time.isoformat()}")
     print(f"Output: {args.output}")
     print(f"Seed: {args.seed}")
+    if args.compress != "none":
+        print(f"Compression: {args.compress}")
     print()
 
-    print("Generating logs...")
-    logs = generate_logs(base_time)
-    write_ndjson(logs, os.path.join(args.output, "logs.ndjson"), "resolve-logs")
-
-    print("Generating metrics...")
-    metrics = generate_metrics(base_time)
-    write_ndjson(metrics, os.path.join(args.output, "metrics.ndjson"), "resolve-metrics")
-
-    print("Generating deployments...")
-    deployments = generate_deployments(base_time)
-    write_ndjson(deployments, os.path.join(args.output, "deployments.ndjson"), "resolve-deployments")
-
-    print("Generating runbooks...")
-    runbooks = generate_runbooks()
-    write_ndjson(runbooks, os.path.join(args.output, "runbooks.ndjson"), "resolve-runbooks")
-
-    print("Generating alerts...")
-    alerts = generate_alerts(base_time)
-    write_ndjson(alerts, os.path.join(args.output, "alerts.ndjson"), "resolve-alerts")
-
-    total = len(logs) + len(metrics) + len(deployments) + len(runbooks) + len(alerts)
-    print(f"\nTotal: {total:,} documents generated")
-    print(f"  Logs:        {len(logs):,}")
-    print(f"  Metrics:     {len(metrics):,}")
-    print(f"  Deployments: {len(deployments)}")
-    print(f"  Runbooks:    {len(runbooks)}")
-    print(f"  Alerts:      {len(alerts)}")
+    # Independent random streams per generator, so parallel output is reproducible
+    seeds = np.random.SeedSequence(args.seed).spawn(len(GENERATORS))
+
+    print(f"Generating {', '.join(GENERATORS)}...")
+    with ProcessPoolExecutor(max_workers=len(GENERATORS)) as pool:
+        futures = {
+            name: pool.submit(_generate_to_file, name, base_time, seed, args.output, args.compress)
+            for name, seed in zip(GENERATORS, seeds)
+        }
+        counts = {name: future.result() for name, future in futures.items()}
+
+    print(f"\nTotal: {sum(counts.values()):,} documents generated")
+    print(f"  Logs:        {counts['logs']:,}")
+    print(f"  Metrics:     {counts['metrics']:,}")
+    print(f"  Deployments: {counts['deployments']}")
+    print(f"  Runbooks:    {counts['runbooks']}")
+    print(f"  Alerts:      {counts['alerts']}")
     print(f"\nIncident timeline:")
-    print(f"  Baseline:    {base_time.isoformat()} to {ts(base_time, INCIDENT_START_MIN)}")
-    print(f"  Bad deploy:  {ts(base_time, 58)}")
-    print(f"  Errors start:{ts(base_time, INCIDENT_START_MIN)}")
-    print(f"  Peak:        {ts(base_time, INCIDENT_PEAK_MIN)}")
-    print(f"  Alert fires: {ts(base_time, ALERT_FIRE_MIN)}")
-    print(f"  Rollback:    {ts(base_time, ROLLBACK_MIN)}")
-    print(f"  Resolved:    {ts(base_time, RESOLVED_MIN)}")
+    print(f"  Baseline:    {base_time.isoformat()} to {ts_minute(base_time, INCIDENT_START_MIN)}")
+    print(f"  Bad deploy:  {ts_minute(base_time, 58)}")
+    print(f"  Errors start:{ts_minute(base_time, INCIDENT_START_MIN)}")
+    print(f"  Peak:        {ts_minute(base_time, INCIDENT_PEAK_MIN)}")
+    print(f"  Alert fires: {ts_minute(base_time, ALERT_FIRE_MIN)}")
+    print(f"  Rollback:    {ts_minute(base_time, ROLLBACK_MIN)}")
+    print(f"  Resolved:    {ts_minute(base_time, RESOLVED_MIN)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,92 @@
+"""
+Resolve - Elasticsearch HTTP transport shared by the demo scripts.
+
+Keep-alive http.client connections (one per host per thread) and a send loop
+that retries only when a replay cannot duplicate work.
+"""
+
+import http.client
+import select
+import ssl
+import threading
+import time
+
+REQUEST_RETRIES = 3  # attempts per request when a connection drops
+
+# Default context for HTTPS connections, built once and shared
+SSL_CONTEXT = ssl.create_default_context()
+
+# Keep-alive connections, one per (scheme, host:port, SSL context) per thread,
+# since an http.client connection cannot be shared by concurrent requests
+_local = threading.local()
+
+
+def get_connection(scheme: str, netloc: str,
+                   context: ssl.SSLContext | None = None) -> http.client.HTTPConnection:
+    """Return this thread's keep-alive connection for a host, opening it if needed.
+
+    HTTPS connections use context, or SSL_CONTEXT when it is None.
+    """
+    context = context or SSL_CONTEXT
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get((scheme, netloc, context))
+    if conn is None:
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(netloc, context=context, timeout=60)
+        else:
+            conn = http.client.HTTPConnection(netloc, timeout=60)
+        connections[(scheme, netloc, context)] = conn
+    return conn
+
+
+def drop_connection(scheme: str, netloc: str, context: ssl.SSLContext | None = None) -> None:
+    """Close and forget this thread's connection so the next request reconnects."""
+    conn = getattr(_local, "connections", {}).pop((scheme, netloc, context or SSL_CONTEXT), None)
+    if conn is not None:
+        conn.close()
+
+
+def is_dropped(conn: http.client.HTTPConnection) -> bool:
+    """True if an idle keep-alive socket was closed by the server.
+
+    An idle connection has nothing to read, so a readable socket means EOF
+    (or a reset) is waiting.
+    """
+    return conn.sock is not None and bool(select.select([conn.sock], [], [], 0)[0])
+
+
+def send(parts, method: str, path: str, body: bytes | None, headers: dict,
+         idempotent: bool | None = None,
+         context: ssl.SSLContext | None = None) -> tuple[http.client.HTTPResponse, bytes]:
+    """Send one request over the keep-alive connection; return (response, raw body).
+
+    parts is the urlsplit() of the target URL. A failure while sending is always
+    retried on a fresh connection, since the server cannot have acted on a
+    partial request. A failure after the request went out (waiting for or
+    reading the response) is retried only when idempotent; a _bulk index
+    replayed there would store every document twice under new _ids. When
+    idempotent is None, every request except a _bulk call counts as idempotent.
+    context overrides SSL_CONTEXT for HTTPS connections.
+    """
+    if idempotent is None:
+        idempotent = not parts.path.endswith("/_bulk")
+    for attempt in range(REQUEST_RETRIES):
+        if attempt:
+            time.sleep(0.5 * 2 ** (attempt - 1))
+        conn = get_connection(parts.scheme, parts.netloc, context)
+        if is_dropped(conn):
+            # Server closed the idle connection; reconnect before sending
+            drop_connection(parts.scheme, parts.netloc, context)
+            conn = get_connection(parts.scheme, parts.netloc, context)
+        sent = False
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            sent = True
+            resp = conn.getresponse()
+            return resp, resp.read()
+        except (http.client.HTTPException, ConnectionError):
+            drop_connection(parts.scheme, parts.netloc, context)
+            if attempt == REQUEST_RETRIES - 1 or (sent and not idempotent):
+                raise
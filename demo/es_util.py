@@ -0,0 +1,126 @@
+"""
+Resolve - .env, JSON, _bulk, refresh and timestamp helpers shared by the demo scripts.
+
+Helpers that talk to Elasticsearch take the calling script's es_request as
+their first argument, so each script keeps its own request encoding (the
+memory-leak trigger gzips its bulk bodies).
+"""
+
+import contextlib
+import functools
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# KEY=VALUE, ignoring blank and comment lines; matching quotes around the
+# value are dropped
+ENV_LINE = re.compile(
+    r"""^[ \t]*([^#\s=][^=\n]*?)[ \t]*=[ \t]*(["']?)(.*?)\2[ \t\r]*$""", re.M
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_env(path: Path, mtime_ns: int) -> dict[str, str]:
+    # mtime_ns is part of the cache key so an edited file is parsed again
+    return {key: value for key, _, value in ENV_LINE.findall(path.read_text())}
+
+
+def load_env(path: Path) -> dict[str, str]:
+    """Load a .env file of KEY=VALUE lines, re-parsing it only when it has changed.
+
+    Exits with an error message if the file does not exist.
+    """
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        print(f"ERROR: .env file not found at {path}")
+        print("Copy .env.example to .env and configure ES_URL and API_KEY.")
+        sys.exit(1)
+    # Copy so callers can't mutate the cached mapping
+    return dict(_parse_env(path, mtime_ns))
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, using orjson when available."""
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode("utf-8")
+
+
+def json_loads(raw: bytes):
+    """Parse a JSON response body straight from bytes, using orjson when available."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+@functools.lru_cache(maxsize=None)
+def action_line(index: str) -> bytes:
+    """Newline-terminated _bulk action line for an index, serialized once per index."""
+    return json_dumps({"index": {"_index": index}}) + b"\n"
+
+
+def add_bulk(body: bytearray, index: str, docs: list[dict | bytes]) -> None:
+    """Append documents to a _bulk NDJSON body as action/source line pairs.
+
+    Documents may be dicts or already-serialized JSON lines (bytes ending in a
+    newline).
+    """
+    action = action_line(index)
+    for doc in docs:
+        body += action
+        if isinstance(doc, bytes):
+            body += doc
+        else:
+            body += json_dumps(doc)
+            body += b"\n"
+
+
+def bulk_index(es_request, es_url: str, api_key: str, index: str, docs: list[dict | bytes]):
+    """Bulk index documents in one _bulk request sent through es_request."""
+    body = bytearray()
+    add_bulk(body, index, docs)
+    return es_request(f"{es_url}/_bulk", api_key, body)
+
+
+@contextlib.contextmanager
+def refresh_paused(es_request, es_url: str, api_key: str, indices: list[str]):
+    """Disable index refreshes while bulk loading, then restore and refresh once.
+
+    Each refresh rebuilds searchable segments, so indexing is cheaper with it
+    off. The closing refresh makes the loaded data searchable right away.
+    """
+    target = ",".join(indices)
+    es_request(f"{es_url}/{target}/_settings", api_key, {"index": {"refresh_interval": "-1"}}, method="PUT")
+    try:
+        yield
+    finally:
+        # null restores the index default rather than assuming what it was
+        es_request(f"{es_url}/{target}/_settings", api_key, {"index": {"refresh_interval": None}}, method="PUT")
+        es_request(f"{es_url}/{target}/_refresh", api_key)
+
+
+@functools.lru_cache(maxsize=256)
+def _second_prefix(epoch_second: int) -> str:
+    """Return 'YYYY-MM-DDTHH:MM:SS' (UTC) for an epoch second."""
+    tm = time.gmtime(epoch_second)
+    return f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}T{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}"
+
+
+def now_ms() -> int:
+    """Current time in integer epoch milliseconds."""
+    return time.time_ns() // 1_000_000
+
+
+def format_ts(base_ms: int, offset_seconds: float = 0) -> str:
+    """Format base_ms + offset as an ISO-8601 UTC timestamp with milliseconds."""
+    second, millis = divmod(base_ms + int(offset_seconds * 1000), 1000)
+    return f"{_second_prefix(second)}.{millis:03d}Z"
+
+
+def now_ts(offset_seconds: float = 0) -> str:
+    """Current time plus offset_seconds as an ISO-8601 UTC timestamp."""
+    return format_ts(now_ms(), offset_seconds)
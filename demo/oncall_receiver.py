@@ -8,14 +8,17 @@ Usage:
     python demo/oncall_receiver.py
 """
 
-import json
+import http.client
 import ssl
 import sys
 import time
-import urllib.error
-import urllib.request
+import urllib.parse
 from datetime import datetime
 from pathlib import Path
+from textwrap import TextWrapper
+
+from es_http import send
+from es_util import json_dumps, json_loads, load_env
 
 
 # ---------------------------------------------------------------------------
@@ -30,79 +33,141 @@ C_CYAN = "\033[96m"
 C_WHITE = "\033[97m"
 C_DIM = "\033[2m"
 
-POLL_INTERVAL = 3  # seconds
-
-
-# ---------------------------------------------------------------------------
-# .env loader
-# ---------------------------------------------------------------------------
-def load_env() -> dict:
-    """Load .env file from project root (KEY=VALUE lines)."""
-    env_path = Path(__file__).parent.parent / ".env"
-    if not env_path.exists():
-        print(f"{C_RED}ERROR:{C_RESET} .env file not found at {env_path}")
-        print("Copy .env.example to .env and configure ES_URL and API_KEY.")
-        sys.exit(1)
-    env = {}
-    with open(env_path) as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                env[key.strip()] = value.strip()
-    return env
+# Poll quickly while notifications are arriving and back off when idle
+POLL_INTERVAL_MIN = 1.0  # seconds
+POLL_INTERVAL_MAX = 10.0  # seconds
+POLL_BACKOFF = 1.5
+# Incidents are stamped when their workflow starts, before they are searchable,
+# and ES refresh is near-real-time; re-scan this far behind the newest
+# @timestamp seen so late arrivals are still caught (seen_ids drops repeats)
+LOOKBACK_MS = 60_000
+# Trim search responses to the fields we read; an empty poll comes back as {}
+SEARCH_FILTER_PATH = "hits.hits._id,hits.hits._source,hits.hits.sort"
+SEARCH_PAGE_SIZE = 500  # hits per _search; fetch_all_docs pages past it with search_after
+ENV_PATH = Path(__file__).parent.parent / ".env"
+
+# Allow self-signed / cloud certs. Passed to es_http.send for the receiver's
+# requests only; es_http's shared default context keeps verifying.
+SSL_CONTEXT = ssl.create_default_context()
+SSL_CONTEXT.check_hostname = False
+SSL_CONTEXT.verify_mode = ssl.CERT_NONE
 
 
 # ---------------------------------------------------------------------------
 # Elasticsearch helpers
 # ---------------------------------------------------------------------------
 def es_request(url: str, api_key: str, data: dict | None = None, method: str = "GET") -> dict | None:
-    """Make an Elasticsearch API request using urllib only."""
-    body = json.dumps(data).encode("utf-8") if data else None
-    req = urllib.request.Request(
-        url,
-        data=body,
-        headers={
-            "Authorization": f"ApiKey {api_key}",
-            "Content-Type": "application/json",
-        },
-        method=method,
-    )
-
-    # Allow self-signed / cloud certs
-    ctx = ssl.create_default_context()
-    ctx.check_hostname = False
-    ctx.verify_mode = ssl.CERT_NONE
+    """Make an Elasticsearch API request over es_http's keep-alive connection.
 
+    Connection errors that outlast es_http's retries are printed and reported
+    as None, so a poll that fails is simply tried again on the next tick.
+    """
+    parts = urllib.parse.urlsplit(url)
+    path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+    body = json_dumps(data) if data else None
+    headers = {
+        "Authorization": f"ApiKey {api_key}",
+        "Content-Type": "application/json",
+    }
     try:
-        with urllib.request.urlopen(req, context=ctx) as resp:
-            return json.loads(resp.read().decode())
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode()[:300]
-        print(f"{C_DIM}  ES error {e.code}: {error_body}{C_RESET}")
+        resp, payload = send(parts, method, path, body, headers, context=SSL_CONTEXT)
+    except (http.client.HTTPException, OSError) as e:
+        print(f"{C_DIM}  Connection error: {e!r}{C_RESET}")
         return None
-    except urllib.error.URLError as e:
-        print(f"{C_DIM}  Connection error: {e.reason}{C_RESET}")
+
+    if resp.status >= 400:
+        print(f"{C_DIM}  ES error {resp.status}: {payload.decode()[:300]}{C_RESET}")
         return None
+    return json_loads(payload)
 
 
-def fetch_all_docs(es_url: str, api_key: str, index: str) -> list[dict]:
-    """Fetch all documents from an index, returning list of (id, source) tuples."""
+def fetch_all_docs(es_url: str, api_key: str, index: str, since: int | None = None) -> list[dict]:
+    """Fetch documents from an index, oldest first.
+
+    With since (epoch millis), only documents whose @timestamp is at or after
+    it are returned, plus any without an @timestamp (sorted last), so each poll
+    transfers just the newest documents. Each returned doc carries its _id and
+    its @timestamp sort value as _sort.
+
+    Results are paged with search_after, so a window holding more than
+    SEARCH_PAGE_SIZE documents is still read to the end.
+    """
     query = {
-        "size": 100,
+        "size": SEARCH_PAGE_SIZE,
         "sort": [{"@timestamp": {"order": "asc", "unmapped_type": "date"}}],
+        "track_total_hits": False,
         "query": {"match_all": {}},
     }
-    result = es_request(f"{es_url}/{index}/_search", api_key, query, method="POST")
-    if not result:
-        return []
-    hits = result.get("hits", {}).get("hits", [])
-    return [{"_id": h["_id"], **h.get("_source", {})} for h in hits]
+    if since is not None:
+        # Filter context: no scoring, and ES can cache the range clause.
+        # Documents without an @timestamp match the second clause on every poll.
+        query["query"] = {
+            "bool": {
+                "filter": {
+                    "bool": {
+                        "should": [
+                            {"range": {"@timestamp": {"gte": since, "format": "epoch_millis"}}},
+                            {"bool": {"must_not": {"exists": {"field": "@timestamp"}}}},
+                        ],
+                        "minimum_should_match": 1,
+                    }
+                }
+            }
+        }
+    url = f"{es_url}/{index}/_search?filter_path={SEARCH_FILTER_PATH}"
+    docs: dict[str, dict] = {}
+    while True:
+        result = es_request(url, api_key, query, method="POST")
+        hits = result.get("hits", {}).get("hits", []) if result else []
+        for h in hits:
+            docs.setdefault(h["_id"], {"_id": h["_id"], "_sort": h.get("sort", [None])[0], **h.get("_source", {})})
+        if len(hits) < SEARCH_PAGE_SIZE:
+            return list(docs.values())
+        first, last = hits[0]["sort"][0], hits[-1]["sort"][0]
+        # Resume one millisecond early so documents sharing the last timestamp
+        # are not skipped (the _id dedupe above drops the repeats). A page that
+        # is all one timestamp would then repeat forever, so step past it
+        # (further documents with that exact timestamp are then missed).
+        query["search_after"] = [last] if first == last else [last - 1]
+
+
+def doc_sort(doc: dict) -> int | None:
+    """Return a fetched doc's @timestamp sort value, or None if it has no @timestamp."""
+    return doc["_sort"] if "@timestamp" in doc else None
+
+
+def high_water_mark(docs: list[dict], current: int | None) -> int | None:
+    """Return the newest @timestamp sort value among docs (or current)."""
+    for doc in docs:
+        ts = doc_sort(doc)
+        if ts is not None:
+            current = ts if current is None else max(current, ts)
+    return current
+
+
+def prune_seen(seen_ids: dict[str, int | None], last_ts: int | None) -> None:
+    """Forget ids older than the poll window.
+
+    Polls only look back LOOKBACK_MS from the high-water mark, so ids stamped
+    before that are never returned again and can be dropped; this keeps memory
+    bounded however large the index grows. Ids without an @timestamp are kept,
+    since those documents can come back on any poll.
+    """
+    if last_ts is None:
+        return
+    cutoff = last_ts - LOOKBACK_MS
+    for doc_id in [i for i, ts in seen_ids.items() if ts is not None and ts < cutoff]:
+        del seen_ids[doc_id]
 
 
 # ---------------------------------------------------------------------------
 # Document type detection
 # ---------------------------------------------------------------------------
+# Values of an explicit 'type' field that are trusted without inspecting the
+# document's structure
+EXPLICIT_TYPES = frozenset({"oncall_notification", "remediation_action"})
+
+
 def detect_doc_type(doc: dict) -> str:
     """Determine the document type from its fields.
 
@@ -111,11 +176,13 @@ def detect_doc_type(doc: dict) -> str:
       - remediation_action:  has 'actions' list or 'action_type'/'details'
       - incident (default):  has 'title' and 'summary'
     """
-    explicit = doc.get("type", "").lower()
-    if explicit == "oncall_notification":
-        return "oncall_notification"
-    if explicit == "remediation_action":
-        return "remediation_action"
+    explicit = doc.get("type")
+    if isinstance(explicit, str):
+        if explicit in EXPLICIT_TYPES:
+            return explicit
+        explicit = explicit.lower()
+        if explicit in EXPLICIT_TYPES:
+            return explicit
 
     # Infer from structure
     if "actions" in doc or ("action_type" in doc) or ("details" in doc and "title" not in doc):
@@ -142,21 +209,38 @@ def severity_color(severity: str) -> str:
 # ---------------------------------------------------------------------------
 # Notification renderers
 # ---------------------------------------------------------------------------
+BORDER = "=" * 56
+
+
+def notification_box(color: str, title: str) -> tuple[str, str]:
+    """Return the pre-rendered (header, footer) of a notification box."""
+    rule = f"  {color}{C_BOLD}{BORDER}{C_RESET}\n"
+    return f"\n{rule}  {color}{C_BOLD}  {title}{C_RESET}\n{rule}\n", f"{rule}\n"
+
+
+INCIDENT_HEADER, INCIDENT_FOOTER = notification_box(C_CYAN, "RESOLVE INCIDENT NOTIFICATION")
+ONCALL_HEADER, ONCALL_FOOTER = notification_box(C_YELLOW, "ON-CALL ALERT")
+REMEDIATION_HEADER, REMEDIATION_FOOTER = notification_box(C_GREEN, "REMEDIATION EXECUTED")
+
+LABELS = {
+    name: f"  {C_BOLD}{C_WHITE}  {name}:{C_RESET}"
+    for name in ("SEVERITY", "SERVICE", "TITLE", "SUMMARY", "STATUS", "ASSIGNED", "TIME",
+                 "INCIDENT", "MESSAGE", "ACTION", "DETAILS")
+}
+
+
+_wrappers: dict[int, TextWrapper] = {}
+
+
 def wrap_text(text: str, width: int = 45, indent: int = 13) -> str:
     """Word-wrap text to fit within the notification box."""
-    words = text.split()
-    lines = []
-    current = ""
-    for word in words:
-        if current and len(current) + 1 + len(word) > width:
-            lines.append(current)
-            current = word
-        else:
-            current = f"{current} {word}" if current else word
-    if current:
-        lines.append(current)
-    pad = " " * indent
-    return ("\n" + pad).join(lines)
+    wrapper = _wrappers.get(width)
+    if wrapper is None:
+        wrapper = _wrappers[width] = TextWrapper(
+            width=width, break_long_words=False, break_on_hyphens=False
+        )
+    # Collapse runs of whitespace first; TextWrapper keeps them inside a line
+    return ("\n" + " " * indent).join(wrapper.wrap(" ".join(text.split())))
 
 
 def render_incident(doc: dict) -> None:
@@ -170,25 +254,20 @@ def render_incident(doc: dict) -> None:
     assigned = doc.get("assigned_to", "unassigned")
     timestamp = doc.get("@timestamp", "unknown")
 
-    border = "=" * 56
-
-    print()
-    print(f"  {C_CYAN}{C_BOLD}{border}{C_RESET}")
-    print(f"  {C_CYAN}{C_BOLD}  RESOLVE INCIDENT NOTIFICATION{C_RESET}")
-    print(f"  {C_CYAN}{C_BOLD}{border}{C_RESET}")
-    print()
-    print(f"  {C_BOLD}{C_WHITE}  SEVERITY:{C_RESET}  {sev_c}{C_BOLD}{sev}{C_RESET}")
-    print(f"  {C_BOLD}{C_WHITE}  SERVICE:{C_RESET}   {service}")
-    print(f"  {C_BOLD}{C_WHITE}  TITLE:{C_RESET}     {wrap_text(title, width=42, indent=15)}")
-    print()
-    print(f"  {C_BOLD}{C_WHITE}  SUMMARY:{C_RESET}   {wrap_text(summary, width=42, indent=15)}")
-    print()
-    print(f"  {C_BOLD}{C_WHITE}  STATUS:{C_RESET}    {C_GREEN}{status}{C_RESET}")
-    print(f"  {C_BOLD}{C_WHITE}  ASSIGNED:{C_RESET}  {assigned}")
-    print(f"  {C_BOLD}{C_WHITE}  TIME:{C_RESET}      {timestamp}")
-    print()
-    print(f"  {C_CYAN}{C_BOLD}{border}{C_RESET}")
-    print()
+    sys.stdout.write(
+        f"{INCIDENT_HEADER}"
+        f"{LABELS['SEVERITY']}  {sev_c}{C_BOLD}{sev}{C_RESET}\n"
+        f"{LABELS['SERVICE']}   {service}\n"
+        f"{LABELS['TITLE']}     {wrap_text(title, width=42, indent=15)}\n"
+        "\n"
+        f"{LABELS['SUMMARY']}   {wrap_text(summary, width=42, indent=15)}\n"
+        "\n"
+        f"{LABELS['STATUS']}    {C_GREEN}{status}{C_RESET}\n"
+        f"{LABELS['ASSIGNED']}  {assigned}\n"
+        f"{LABELS['TIME']}      {timestamp}\n"
+        "\n"
+        f"{INCIDENT_FOOTER}"
+    )
 
 
 def render_oncall(doc: dict) -> None:
@@ -200,23 +279,18 @@ def render_oncall(doc: dict) -> None:
     incident_id = doc.get("incident_id", "N/A")
     timestamp = doc.get("@timestamp", "unknown")
 
-    border = "=" * 56
-
-    print()
-    print(f"  {C_YELLOW}{C_BOLD}{border}{C_RESET}")
-    print(f"  {C_YELLOW}{C_BOLD}  ON-CALL ALERT{C_RESET}")
-    print(f"  {C_YELLOW}{C_BOLD}{border}{C_RESET}")
-    print()
-    print(f"  {C_BOLD}{C_WHITE}  SEVERITY:{C_RESET}    {sev_c}{C_BOLD}{sev}{C_RESET}")
-    print(f"  {C_BOLD}{C_WHITE}  SERVICE:{C_RESET}     {service}")
-    print(f"  {C_BOLD}{C_WHITE}  INCIDENT:{C_RESET}    {incident_id}")
-    print()
-    print(f"  {C_BOLD}{C_WHITE}  MESSAGE:{C_RESET}     {wrap_text(message, width=40, indent=17)}")
-    print()
-    print(f"  {C_BOLD}{C_WHITE}  TIME:{C_RESET}        {timestamp}")
-    print()
-    print(f"  {C_YELLOW}{C_BOLD}{border}{C_RESET}")
-    print()
+    sys.stdout.write(
+        f"{ONCALL_HEADER}"
+        f"{LABELS['SEVERITY']}    {sev_c}{C_BOLD}{sev}{C_RESET}\n"
+        f"{LABELS['SERVICE']}     {service}\n"
+        f"{LABELS['INCIDENT']}    {incident_id}\n"
+        "\n"
+        f"{LABELS['MESSAGE']}     {wrap_text(message, width=40, indent=17)}\n"
+        "\n"
+        f"{LABELS['TIME']}        {timestamp}\n"
+        "\n"
+        f"{ONCALL_FOOTER}"
+    )
 
 
 def render_remediation(doc: dict) -> None:
@@ -242,30 +316,37 @@ def render_remediation(doc: dict) -> None:
     if not details:
         details = "No details provided."
 
-    border = "=" * 56
+    sys.stdout.write(
+        f"{REMEDIATION_HEADER}"
+        f"{LABELS['ACTION']}     {C_GREEN}{C_BOLD}{action_type.upper()}{C_RESET}\n"
+        f"{LABELS['SERVICE']}    {service}\n"
+        f"{LABELS['INCIDENT']}   {incident_id}\n"
+        "\n"
+        f"{LABELS['DETAILS']}    {wrap_text(details, width=40, indent=16)}\n"
+        "\n"
+        f"{LABELS['TIME']}       {timestamp}\n"
+        "\n"
+        f"{REMEDIATION_FOOTER}"
+    )
 
-    print()
-    print(f"  {C_GREEN}{C_BOLD}{border}{C_RESET}")
-    print(f"  {C_GREEN}{C_BOLD}  REMEDIATION EXECUTED{C_RESET}")
-    print(f"  {C_GREEN}{C_BOLD}{border}{C_RESET}")
-    print()
-    print(f"  {C_BOLD}{C_WHITE}  ACTION:{C_RESET}     {C_GREEN}{C_BOLD}{action_type.upper()}{C_RESET}")
-    print(f"  {C_BOLD}{C_WHITE}  SERVICE:{C_RESET}    {service}")
-    print(f"  {C_BOLD}{C_WHITE}  INCIDENT:{C_RESET}   {incident_id}")
-    print()
-    print(f"  {C_BOLD}{C_WHITE}  DETAILS:{C_RESET}    {wrap_text(details, width=40, indent=16)}")
-    print()
-    print(f"  {C_BOLD}{C_WHITE}  TIME:{C_RESET}       {timestamp}")
-    print()
-    print(f"  {C_GREEN}{C_BOLD}{border}{C_RESET}")
-    print()
+
+# Document type -> renderer
+RENDERERS = {
+    "incident": render_incident,
+    "oncall_notification": render_oncall,
+    "remediation_action": render_remediation,
+}
 
 
 # ---------------------------------------------------------------------------
 # Main polling loop
 # ---------------------------------------------------------------------------
 def main() -> None:
-    env = load_env()
+    # Block-buffer stdout (it is line-buffered on a terminal) and flush once
+    # per notification, so each box reaches the terminal in a single write
+    sys.stdout.reconfigure(line_buffering=False)
+
+    env = load_env(ENV_PATH)
     es_url = env.get("ES_URL", "").rstrip("/")
     api_key = env.get("API_KEY", "")
 
@@ -274,43 +355,57 @@ def main() -> None:
         sys.exit(1)
 
     index = "resolve-incidents"
-    seen_ids: set[str] = set()
+    # _id -> @timestamp sort value (None when the doc has no @timestamp)
+    seen_ids: dict[str, int | None] = {}
 
     # Seed seen_ids with any existing documents so we only show new ones
     print(f"{C_DIM}  Connecting to Elasticsearch...{C_RESET}")
-    existing = fetch_all_docs(es_url, api_key, index)
-    for doc in existing:
-        seen_ids.add(doc["_id"])
-
-    if existing:
-        print(f"{C_DIM}  Found {len(existing)} existing document(s) -- skipping.{C_RESET}")
+    sys.stdout.flush()
+    docs = fetch_all_docs(es_url, api_key, index)
+    seen_ids.update((d["_id"], doc_sort(d)) for d in docs)
+    last_ts = high_water_mark(docs, None)
+    prune_seen(seen_ids, last_ts)
+
+    if docs:
+        print(f"{C_DIM}  Found {len(docs)} existing document(s) -- skipping.{C_RESET}")
     print()
     print(f"  {C_CYAN}{C_BOLD}Watching {index} for new notifications...{C_RESET}")
     print(f"  {C_DIM}Press Ctrl+C to stop.{C_RESET}")
     print()
+    sys.stdout.flush()
 
+    interval = POLL_INTERVAL_MIN
     try:
         while True:
-            docs = fetch_all_docs(es_url, api_key, index)
+            # Only documents from LOOKBACK_MS before the newest timestamp seen
+            # so far, so late-visible ones are not skipped; seen_ids filters
+            # the ones already shown.
+            since = None if last_ts is None else last_ts - LOOKBACK_MS
+            docs = fetch_all_docs(es_url, api_key, index, since=since)
+            last_ts = high_water_mark(docs, last_ts)
+            new_docs = False
             for doc in docs:
                 doc_id = doc["_id"]
                 if doc_id in seen_ids:
                     continue
 
-                seen_ids.add(doc_id)
+                seen_ids[doc_id] = doc_sort(doc)
+                new_docs = True
                 doc_type = detect_doc_type(doc)
 
                 ts = datetime.now().strftime("%H:%M:%S")
                 print(f"  {C_DIM}[{ts}] New document: {doc_id} (type: {doc_type}){C_RESET}")
 
-                if doc_type == "oncall_notification":
-                    render_oncall(doc)
-                elif doc_type == "remediation_action":
-                    render_remediation(doc)
-                else:
-                    render_incident(doc)
+                RENDERERS[doc_type](doc)
+                sys.stdout.flush()
 
-            time.sleep(POLL_INTERVAL)
+            prune_seen(seen_ids, last_ts)
+            sys.stdout.flush()  # surface any connection errors from this poll
+            if new_docs:
+                interval = POLL_INTERVAL_MIN
+            else:
+                interval = min(interval * POLL_BACKOFF, POLL_INTERVAL_MAX)
+            time.sleep(interval)
 
     except KeyboardInterrupt:
         print(f"\n  {C_DIM}Stopped.{C_RESET}\n")
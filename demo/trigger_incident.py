@@ -10,101 +10,150 @@ Usage:
 """
 
 import argparse
-import json
 import os
-import random
 import sys
 import time
-import urllib.request
-import urllib.error
-from datetime import datetime, timedelta, timezone
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 
-def load_env():
-    """Load .env file."""
-    env_path = Path(__file__).parent.parent / ".env"
-    if not env_path.exists():
-        print("ERROR: .env file not found. Copy .env.example to .env and configure.")
-        sys.exit(1)
-    env = {}
-    with open(env_path) as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                env[key.strip()] = value.strip()
-    return env
-
-
-def es_request(url: str, api_key: str, data: dict | list | None = None, method: str = "POST"):
-    """Make an Elasticsearch API request."""
-    body = None
-    if data is not None:
-        if isinstance(data, list):
-            # Bulk format: list of strings
-            body = "\n".join(data) + "\n"
-        else:
-            body = json.dumps(data)
-
-    req = urllib.request.Request(
-        url,
-        data=body.encode("utf-8") if body else None,
-        headers={
-            "Authorization": f"ApiKey {api_key}",
-            "Content-Type": "application/x-ndjson" if isinstance(data, list) else "application/json",
-        },
-        method=method,
-    )
-    try:
-        with urllib.request.urlopen(req) as resp:
-            return json.loads(resp.read().decode())
-    except urllib.error.HTTPError as e:
-        print(f"  HTTP {e.code}: {e.read().decode()[:200]}")
-        return None
+from es_http import send
+from es_util import (
+    action_line, bulk_index, format_ts, json_dumps, json_loads, load_env, now_ms, now_ts,
+    refresh_paused,
+)
+
+BULK_THREADS = 8  # concurrent _bulk requests in bulk_index_concurrently; the work is network-bound
+# Per-request limits for buffered _bulk uploads
+BULK_CHUNK_DOCS = 1000
+BULK_CHUNK_BYTES = 10 * 1024 * 1024
+
+# Shared by all generators; random fields are drawn in bulk, one vector per
+# field. Seeded from OS entropy unless --seed is given.
+rng = np.random.default_rng()
 
+ENV_PATH = Path(__file__).parent.parent / ".env"
 
-def bulk_index(es_url: str, api_key: str, index: str, docs: list[dict]):
-    """Bulk index documents."""
-    lines = []
-    for doc in docs:
-        lines.append(json.dumps({"index": {"_index": index}}))
-        lines.append(json.dumps(doc))
-    return es_request(f"{es_url}/_bulk", api_key, lines)
 
+def es_request(url: str, api_key: str, data: dict | bytes | bytearray | None = None, method: str = "POST"):
+    """Make an Elasticsearch API request over a reused keep-alive connection.
 
-def now_ts(offset_seconds: float = 0) -> str:
-    dt = datetime.now(timezone.utc) + timedelta(seconds=offset_seconds)
-    return dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+    data is a JSON body (dict) or a ready-made NDJSON bulk body (bytes).
+    """
+    body = None
+    if data is not None:
+        body = json_dumps(data) if isinstance(data, dict) else data
+
+    parts = urllib.parse.urlsplit(url)
+    path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+    headers = {
+        "Authorization": f"ApiKey {api_key}",
+        "Content-Type": "application/json" if isinstance(data, dict) else "application/x-ndjson",
+    }
+    resp, payload = send(parts, method, path, body, headers)
+    if resp.status >= 400:
+        print(f"  HTTP {resp.status}: {payload.decode()[:200]}")
+        return None
+    return json_loads(payload)
+
+
+class BulkBuffer:
+    """Accumulate documents into _bulk bodies, sending one whenever a chunk fills up.
+
+    A chunk holds at most chunk_size documents and max_bytes of NDJSON; call
+    flush() to send whatever remains.
+    """
+
+    def __init__(self, es_url: str, api_key: str,
+                 chunk_size: int = BULK_CHUNK_DOCS, max_bytes: int = BULK_CHUNK_BYTES):
+        self.url = f"{es_url}/_bulk"
+        self.api_key = api_key
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.body = bytearray()
+        self.count = 0
+
+    def add(self, index: str, docs: list[dict | bytes]) -> None:
+        action = action_line(index)
+        for doc in docs:
+            source = doc if isinstance(doc, bytes) else json_dumps(doc) + b"\n"
+            if self.count >= self.chunk_size or len(self.body) + len(action) + len(source) > self.max_bytes:
+                self.flush()
+            self.body += action
+            self.body += source
+            self.count += 1
+
+    def flush(self) -> None:
+        if self.count:
+            es_request(self.url, self.api_key, self.body)
+            self.body = bytearray()
+            self.count = 0
+
+
+def bulk_index_concurrently(es_url: str, api_key: str, batches: list[tuple[str, list[dict | bytes]]]):
+    """Bulk index several (index, docs) batches concurrently, one _bulk request each."""
+    if not batches:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(batches), BULK_THREADS)) as pool:
+        return list(pool.map(lambda batch: bulk_index(es_request, es_url, api_key, *batch), batches))
 
 
 # ---------------------------------------------------------------------------
 # Incident Data Generators
 # ---------------------------------------------------------------------------
 
-def gen_baseline_metrics(t_offset: float = 0) -> list[dict]:
-    """Generate healthy baseline metrics for all services."""
-    docs = []
-    for service, hosts in [
-        ("order-service", ["order-svc-01", "order-svc-02"]),
-        ("payment-service", ["payment-svc-01", "payment-svc-02"]),
-        ("notification-service", ["notif-svc-01", "notif-svc-02"]),
-        ("user-service", ["user-svc-01", "user-svc-02"]),
-        ("api-gateway", ["api-gw-01", "api-gw-02"]),
-    ]:
-        for host in hosts:
-            docs.append({
-                "@timestamp": now_ts(t_offset),
-                "service": service,
-                "host": host,
-                "cpu_percent": round(random.uniform(20, 40), 1),
-                "memory_percent": round(random.uniform(40, 55), 1),
-                "request_latency_ms": round(random.uniform(50, 150), 1),
-                "error_rate": round(random.uniform(0.001, 0.005), 4),
-                "requests_per_second": round(random.uniform(200, 500), 1),
-                "active_connections": random.randint(80, 200),
-            })
-    return docs
+# Every (service, host) pair reporting baseline and recovery metrics
+SERVICE_HOSTS: tuple[tuple[str, str], ...] = (
+    ("order-service", "order-svc-01"), ("order-service", "order-svc-02"),
+    ("payment-service", "payment-svc-01"), ("payment-service", "payment-svc-02"),
+    ("notification-service", "notif-svc-01"), ("notification-service", "notif-svc-02"),
+    ("user-service", "user-svc-01"), ("user-service", "user-svc-02"),
+    ("api-gateway", "api-gw-01"), ("api-gateway", "api-gw-02"),
+)
+
+# Degraded metric levels during the incident, per reporting host:
+# (service, host, cpu, mem, latency, error rate, rps, connections)
+INCIDENT_METRICS = (
+    ("order-service", "order-svc-01", 85, 72, 2400, 0.45, 150, 350),
+    ("order-service", "order-svc-02", 85, 72, 2400, 0.45, 150, 350),
+    ("payment-service", "payment-svc-01", 55, 58, 1200, 0.22, 250, 200),
+    ("notification-service", "notif-svc-01", 45, 52, 800, 0.18, 180, 160),
+    ("api-gateway", "api-gw-01", 55, 52, 450, 0.12, 600, 550),
+    ("api-gateway", "api-gw-02", 55, 52, 450, 0.12, 600, 550),
+    ("user-service", "user-svc-01", 26, 46, 85, 0.002, 380, 155),
+)
+INCIDENT_HOSTS = tuple((service, host) for service, host, *_ in INCIDENT_METRICS)
+INCIDENT_LEVELS = np.array([levels for _, _, *levels in INCIDENT_METRICS], dtype=np.float64)
+
+
+def metric_lines(ts: str, hosts, cpu, mem, lat, err, rps, conns) -> list[bytes]:
+    """Serialize one metric document per (service, host) straight to a JSON line.
+
+    The schema is fixed, so values go into a template instead of through a
+    dict. Rounded floats never reach exponent notation, so str() renders them
+    exactly as the JSON encoders do.
+    """
+    return [
+        (f'{{"@timestamp":"{ts}","service":"{service}","host":"{host}","cpu_percent":{c},'
+         f'"memory_percent":{m},"request_latency_ms":{lt},"error_rate":{e},'
+         f'"requests_per_second":{r},"active_connections":{k}}}\n').encode()
+        for (service, host), c, m, lt, e, r, k in zip(hosts, cpu, mem, lat, err, rps, conns)
+    ]
+
+
+def gen_baseline_metrics(t_offset: float = 0) -> list[bytes]:
+    """Generate healthy baseline metrics for all services, as JSON lines."""
+    ts = now_ts(t_offset)
+    n = len(SERVICE_HOSTS)
+    cpu = rng.uniform(20, 40, n).round(1).tolist()
+    mem = rng.uniform(40, 55, n).round(1).tolist()
+    lat = rng.uniform(50, 150, n).round(1).tolist()
+    err = rng.uniform(0.001, 0.005, n).round(4).tolist()
+    rps = rng.uniform(200, 500, n).round(1).tolist()
+    conns = rng.integers(80, 201, n).tolist()
+    return metric_lines(ts, SERVICE_HOSTS, cpu, mem, lat, err, rps, conns)
 
 
 def gen_bad_deployment(t_offset: float = 0) -> list[dict]:
@@ -120,10 +169,60 @@ def gen_bad_deployment(t_offset: float = 0) -> list[dict]:
     }]
 
 
+# Peak-phase error logs per affected service:
+# (service, hosts, request path, timestamp jitter range in seconds,
+#  response time range in ms, [(level, message, error code), ...])
+PEAK_ERROR_GROUPS = (
+    ("order-service", ("order-svc-01", "order-svc-02", "order-svc-03"), "/api/orders", (0, 10), (10000, 30000), (
+        ("critical", "Database connection pool depleted - all requests failing", "DB_POOL_CRITICAL"),
+        ("error", "Connection pool exhausted: max 5 connections reached, 47 waiting", "DB_POOL_EXHAUSTED"),
+        ("critical", "Circuit breaker OPEN for database connections - 95% failure rate", "CIRCUIT_OPEN"),
+        ("error", "Transaction rollback: could not persist order to database", "TX_ROLLBACK"),
+        ("error", "Health check failed: database connection pool at 100% utilization", "HEALTH_CHECK_FAIL"),
+    )),
+    ("payment-service", ("payment-svc-01",), "/api/payments", (5, 15), (15000, 30000), (
+        ("error", "Timeout waiting for order-service response after 30000ms", "UPSTREAM_TIMEOUT"),
+        ("error", "Circuit breaker OPEN for order-service - consecutive failures: 15", "CIRCUIT_OPEN"),
+    )),
+    ("notification-service", ("notif-svc-01",), "/api/notify/email", (8, 18), (5000, 15000), (
+        ("error", "Failed to fetch order details for notification: connection refused", "UPSTREAM_ERROR"),
+        ("warn", "Notification queue backing up: 450 pending, order-service unreachable", "QUEUE_BACKLOG"),
+    )),
+    ("api-gateway", ("api-gw-01",), "/api/v1/orders", (3, 12), (10000, 60000), (
+        ("error", "502 Bad Gateway: order-service returned no response", "BAD_GATEWAY"),
+        ("warn", "Elevated error rate on /api/v1/orders: 43% of requests failing", "HIGH_ERROR_RATE"),
+    )),
+)
+
+
+def gen_service_errors(base: int, t_offset: float, service: str, hosts: tuple[str, ...], request_path: str,
+                       jitter: tuple[float, float], response_ms: tuple[int, int],
+                       errors: tuple[tuple[str, str, str | None], ...]) -> list[dict]:
+    """Generate one error log per (error, host) for a service, jittered after base + t_offset (epoch ms)."""
+    rows = [(error, host) for error in errors for host in hosts]
+    # Random fields are drawn up front, one vector per field
+    n = len(rows)
+    offsets = (t_offset + rng.uniform(*jitter, n)).tolist()
+    trace_ids = rng.integers(1000, 10000, n).tolist()
+    response_times = rng.integers(response_ms[0], response_ms[1] + 1, n).tolist()
+    docs = []
+    for ((level, msg, code), host), offset, trace_id, rt in zip(rows, offsets, trace_ids, response_times):
+        doc = {"@timestamp": format_ts(base, offset),
+               "level": level, "service": service, "message": msg,
+               "host": host, "trace_id": f"trace-{trace_id}",
+               "request_path": request_path, "response_time_ms": rt}
+        if code:
+            doc["error_code"] = code
+        docs.append(doc)
+    return docs
+
+
 def gen_error_logs(phase: str, t_offset: float = 0) -> list[dict]:
     """Generate error logs for different incident phases."""
     docs = []
-    ts = now_ts(t_offset)
+    # One clock read per phase; per-document jitter is added to this base
+    base = now_ms()
+    ts = format_ts(base, t_offset)
 
     if phase == "early":
         messages = [
@@ -131,99 +230,38 @@ def gen_error_logs(phase: str, t_offset: float = 0) -> list[dict]:
             ("error", "Failed to acquire database connection after 30000ms timeout", "DB_CONN_TIMEOUT"),
             ("warn", "Database connection pool utilization at 100%", None),
         ]
-        for level, msg, code in messages:
+        n = len(messages)
+        hosts = rng.choice(["order-svc-01", "order-svc-02"], n).tolist()
+        trace_ids = rng.integers(1000, 10000, n).tolist()
+        response_times = rng.integers(5000, 30001, n).tolist()
+        for (level, msg, code), host, trace_id, rt in zip(messages, hosts, trace_ids, response_times):
             doc = {"@timestamp": ts, "level": level, "service": "order-service",
-                   "message": msg, "host": random.choice(["order-svc-01", "order-svc-02"]),
-                   "trace_id": f"trace-{random.randint(1000,9999)}", "request_path": "/api/orders",
-                   "response_time_ms": random.randint(5000, 30000)}
+                   "message": msg, "host": host,
+                   "trace_id": f"trace-{trace_id}", "request_path": "/api/orders",
+                   "response_time_ms": rt}
             if code:
                 doc["error_code"] = code
             docs.append(doc)
 
     elif phase == "peak":
-        order_errors = [
-            ("critical", "Database connection pool depleted - all requests failing", "DB_POOL_CRITICAL"),
-            ("error", "Connection pool exhausted: max 5 connections reached, 47 waiting", "DB_POOL_EXHAUSTED"),
-            ("critical", "Circuit breaker OPEN for database connections - 95% failure rate", "CIRCUIT_OPEN"),
-            ("error", "Transaction rollback: could not persist order to database", "TX_ROLLBACK"),
-            ("error", "Health check failed: database connection pool at 100% utilization", "HEALTH_CHECK_FAIL"),
-        ]
-        payment_errors = [
-            ("error", "Timeout waiting for order-service response after 30000ms", "UPSTREAM_TIMEOUT"),
-            ("error", "Circuit breaker OPEN for order-service - consecutive failures: 15", "CIRCUIT_OPEN"),
-        ]
-        notif_errors = [
-            ("error", "Failed to fetch order details for notification: connection refused", "UPSTREAM_ERROR"),
-            ("warn", "Notification queue backing up: 450 pending, order-service unreachable", "QUEUE_BACKLOG"),
-        ]
-        gateway_errors = [
-            ("error", "502 Bad Gateway: order-service returned no response", "BAD_GATEWAY"),
-            ("warn", "Elevated error rate on /api/v1/orders: 43% of requests failing", "HIGH_ERROR_RATE"),
-        ]
-
-        for level, msg, code in order_errors:
-            for host in ["order-svc-01", "order-svc-02", "order-svc-03"]:
-                doc = {"@timestamp": now_ts(t_offset + random.uniform(0, 10)),
-                       "level": level, "service": "order-service", "message": msg,
-                       "host": host, "trace_id": f"trace-{random.randint(1000,9999)}",
-                       "request_path": "/api/orders", "response_time_ms": random.randint(10000, 30000)}
-                if code:
-                    doc["error_code"] = code
-                docs.append(doc)
-
-        for level, msg, code in payment_errors:
-            doc = {"@timestamp": now_ts(t_offset + random.uniform(5, 15)),
-                   "level": level, "service": "payment-service", "message": msg,
-                   "host": "payment-svc-01", "trace_id": f"trace-{random.randint(1000,9999)}",
-                   "request_path": "/api/payments", "response_time_ms": random.randint(15000, 30000)}
-            if code:
-                doc["error_code"] = code
-            docs.append(doc)
-
-        for level, msg, code in notif_errors:
-            doc = {"@timestamp": now_ts(t_offset + random.uniform(8, 18)),
-                   "level": level, "service": "notification-service", "message": msg,
-                   "host": "notif-svc-01", "trace_id": f"trace-{random.randint(1000,9999)}",
-                   "request_path": "/api/notify/email", "response_time_ms": random.randint(5000, 15000)}
-            if code:
-                doc["error_code"] = code
-            docs.append(doc)
-
-        for level, msg, code in gateway_errors:
-            doc = {"@timestamp": now_ts(t_offset + random.uniform(3, 12)),
-                   "level": level, "service": "api-gateway", "message": msg,
-                   "host": "api-gw-01", "trace_id": f"trace-{random.randint(1000,9999)}",
-                   "request_path": "/api/v1/orders", "response_time_ms": random.randint(10000, 60000)}
-            if code:
-                doc["error_code"] = code
-            docs.append(doc)
+        for group in PEAK_ERROR_GROUPS:
+            docs.extend(gen_service_errors(base, t_offset, *group))
 
     return docs
 
 
-def gen_incident_metrics(t_offset: float = 0) -> list[dict]:
-    """Generate degraded metrics during incident."""
-    docs = []
+def gen_incident_metrics(t_offset: float = 0) -> list[bytes]:
+    """Generate degraded metrics during incident, as JSON lines."""
     ts = now_ts(t_offset)
-    configs = [
-        ("order-service", ["order-svc-01", "order-svc-02"], 85, 72, 2400, 0.45, 150, 350),
-        ("payment-service", ["payment-svc-01"], 55, 58, 1200, 0.22, 250, 200),
-        ("notification-service", ["notif-svc-01"], 45, 52, 800, 0.18, 180, 160),
-        ("api-gateway", ["api-gw-01", "api-gw-02"], 55, 52, 450, 0.12, 600, 550),
-        ("user-service", ["user-svc-01"], 26, 46, 85, 0.002, 380, 155),
-    ]
-    for service, hosts, cpu, mem, lat, err, rps, conns in configs:
-        for host in hosts:
-            docs.append({
-                "@timestamp": ts, "service": service, "host": host,
-                "cpu_percent": round(cpu + random.uniform(-3, 3), 1),
-                "memory_percent": round(mem + random.uniform(-2, 2), 1),
-                "request_latency_ms": round(lat + random.uniform(-100, 100), 1),
-                "error_rate": round(err + random.uniform(-0.02, 0.02), 4),
-                "requests_per_second": round(rps + random.uniform(-20, 20), 1),
-                "active_connections": int(conns + random.uniform(-20, 20)),
-            })
-    return docs
+    levels = INCIDENT_LEVELS
+    n = len(INCIDENT_HOSTS)
+    cpu = (levels[:, 0] + rng.uniform(-3, 3, n)).round(1).tolist()
+    mem = (levels[:, 1] + rng.uniform(-2, 2, n)).round(1).tolist()
+    lat = (levels[:, 2] + rng.uniform(-100, 100, n)).round(1).tolist()
+    err = (levels[:, 3] + rng.uniform(-0.02, 0.02, n)).round(4).tolist()
+    rps = (levels[:, 4] + rng.uniform(-20, 20, n)).round(1).tolist()
+    conns = (levels[:, 5] + rng.uniform(-20, 20, n)).astype(np.int64).tolist()
+    return metric_lines(ts, INCIDENT_HOSTS, cpu, mem, lat, err, rps, conns)
 
 
 def gen_alert(t_offset: float = 0) -> list[dict]:
@@ -241,28 +279,17 @@ def gen_alert(t_offset: float = 0) -> list[dict]:
     }]
 
 
-def gen_recovery_metrics(t_offset: float = 0) -> list[dict]:
-    """Generate recovering metrics."""
-    docs = []
+def gen_recovery_metrics(t_offset: float = 0) -> list[bytes]:
+    """Generate recovering metrics, as JSON lines."""
     ts = now_ts(t_offset)
-    for service, hosts in [
-        ("order-service", ["order-svc-01", "order-svc-02"]),
-        ("payment-service", ["payment-svc-01", "payment-svc-02"]),
-        ("notification-service", ["notif-svc-01", "notif-svc-02"]),
-        ("user-service", ["user-svc-01", "user-svc-02"]),
-        ("api-gateway", ["api-gw-01", "api-gw-02"]),
-    ]:
-        for host in hosts:
-            docs.append({
-                "@timestamp": ts, "service": service, "host": host,
-                "cpu_percent": round(random.uniform(25, 40), 1),
-                "memory_percent": round(random.uniform(42, 55), 1),
-                "request_latency_ms": round(random.uniform(60, 180), 1),
-                "error_rate": round(random.uniform(0.001, 0.008), 4),
-                "requests_per_second": round(random.uniform(250, 500), 1),
-                "active_connections": random.randint(100, 200),
-            })
-    return docs
+    n = len(SERVICE_HOSTS)
+    cpu = rng.uniform(25, 40, n).round(1).tolist()
+    mem = rng.uniform(42, 55, n).round(1).tolist()
+    lat = rng.uniform(60, 180, n).round(1).tolist()
+    err = rng.uniform(0.001, 0.008, n).round(4).tolist()
+    rps = rng.uniform(250, 500, n).round(1).tolist()
+    conns = rng.integers(100, 201, n).tolist()
+    return metric_lines(ts, SERVICE_HOSTS, cpu, mem, lat, err, rps, conns)
 
 
 def gen_rollback_deployment(t_offset: float = 0) -> list[dict]:
@@ -292,9 +319,16 @@ C_RESET = "\033[0m"
 C_BOLD = "\033[1m"
 
 
+# (color, label) -> text before and after the clock in a log line
+_log_prefixes: dict[tuple[str, str], tuple[str, str]] = {}
+
+
 def log(color: str, label: str, message: str):
-    t = datetime.now().strftime("%H:%M:%S")
-    print(f"  {color}[{t}] {label}{C_RESET} {message}")
+    parts = _log_prefixes.get((color, label))
+    if parts is None:
+        parts = _log_prefixes[(color, label)] = (f"  {color}[", f"] {label}{C_RESET} ")
+    # One write per line; stays on the text layer so it interleaves with print()
+    sys.stdout.write(f"{parts[0]}{time.strftime('%H:%M:%S')}{parts[1]}{message}\n")
 
 
 def main():
@@ -303,9 +337,15 @@ def main():
                         help="realtime: inject with delays for demo. batch: inject all at once for testing.")
     parser.add_argument("--recover", action="store_true",
                         help="Inject recovery data (run after agent suggests rollback)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Random seed for reproducible metric/log values (timestamps still follow the clock)")
     args = parser.parse_args()
 
-    env = load_env()
+    if args.seed is not None:
+        global rng
+        rng = np.random.default_rng(args.seed)
+
+    env = load_env(ENV_PATH)
     es_url = env.get("ES_URL", "")
     api_key = env.get("API_KEY", "")
 
@@ -313,18 +353,16 @@ def main():
         print("ERROR: ES_URL and API_KEY must be set in .env")
         sys.exit(1)
 
-    random.seed()
-
     if args.recover:
         print(f"\n{C_BOLD}{C_GREEN}=== Resolve: Injecting Recovery Data ==={C_RESET}\n")
 
         log(C_GREEN, "ROLLBACK", "Deploying order-service v2.3.9 (rollback)")
-        bulk_index(es_url, api_key, "resolve-deployments", gen_rollback_deployment())
+        bulk_index(es_request, es_url, api_key, "resolve-deployments", gen_rollback_deployment())
 
         log(C_GREEN, "RECOVER", "Injecting recovering metrics...")
         for i in range(3):
             time.sleep(2)
-            bulk_index(es_url, api_key, "resolve-metrics", gen_recovery_metrics(i * 60))
+            bulk_index(es_request, es_url, api_key, "resolve-metrics", gen_recovery_metrics(i * 60))
             log(C_GREEN, "METRICS", f"Recovery metrics batch {i+1}/3")
 
         log(C_GREEN, "RESOLVE", "Injecting recovery logs...")
@@ -342,48 +380,69 @@ def main():
              "host": "payment-svc-01", "trace_id": "trace-recovery", "request_path": "/healthz",
              "response_time_ms": 45},
         ]
-        bulk_index(es_url, api_key, "resolve-logs", recovery_logs)
+        bulk_index(es_request, es_url, api_key, "resolve-logs", recovery_logs)
 
         print(f"\n{C_BOLD}{C_GREEN}Recovery data injected. Services returning to normal.{C_RESET}\n")
         return
 
     # --- Incident injection ---
-    delay = (lambda s: time.sleep(s)) if args.mode == "realtime" else (lambda s: None)
+    # Realtime mode indexes each phase as it happens; batch mode has no timing
+    # to preserve, so phases are collected and uploaded together at the end.
+    pending: list[tuple[str, list[dict | bytes]]] = []
+    if args.mode == "realtime":
+        delay = time.sleep
+        inject = lambda index, docs: bulk_index(es_request, es_url, api_key, index, docs)
+    else:
+        delay = lambda s: None
+        inject = lambda index, docs: pending.append((index, docs))
 
     print(f"\n{C_BOLD}{C_RED}=== Resolve: Live Incident Trigger ({args.mode} mode) ==={C_RESET}\n")
 
     # Phase 1: Baseline
     log(C_GREEN, "BASELINE", "Injecting healthy baseline metrics...")
-    for i in range(3):
-        bulk_index(es_url, api_key, "resolve-metrics", gen_baseline_metrics(-180 + i * 60))
+    baseline = [("resolve-metrics", gen_baseline_metrics(-180 + i * 60)) for i in range(3)]
+    if args.mode == "realtime":
+        # The three minutes of baseline are independent; post them concurrently
+        bulk_index_concurrently(es_url, api_key, baseline)
+    else:
+        pending.extend(baseline)
     log(C_GREEN, "BASELINE", "All services healthy")
     delay(3)
 
     # Phase 2: Bad deployment
     log(C_YELLOW, "DEPLOY", "order-service v2.4.1 deployed by bob.kumar")
     log(C_YELLOW, "DEPLOY", "Changes: 'Updated DB connection pool config... max pool size from 50 to 5'")
-    bulk_index(es_url, api_key, "resolve-deployments", gen_bad_deployment())
+    inject("resolve-deployments", gen_bad_deployment())
     delay(5)
 
     # Phase 3: First errors
     log(C_RED, "ERRORS", "First database connection errors appearing...")
-    bulk_index(es_url, api_key, "resolve-logs", gen_error_logs("early"))
+    inject("resolve-logs", gen_error_logs("early"))
     delay(5)
 
     # Phase 4: Metrics degradation
     log(C_RED, "METRICS", "Error rate spiking on order-service...")
-    bulk_index(es_url, api_key, "resolve-metrics", gen_incident_metrics())
+    inject("resolve-metrics", gen_incident_metrics())
     delay(5)
 
     # Phase 5: Full cascade + more error logs
     log(C_RED, "CASCADE", "Cascading failures in payment-service and notification-service!")
-    bulk_index(es_url, api_key, "resolve-logs", gen_error_logs("peak"))
+    inject("resolve-logs", gen_error_logs("peak"))
     delay(5)
 
     # Phase 6: Alert fires
     log(C_RED, "ALERT", "CRITICAL: order-service error rate > 30% for 5 minutes")
     log(C_RED, "ALERT", "Cascading failures detected in payment-service and notification-service")
-    bulk_index(es_url, api_key, "resolve-alerts", gen_alert())
+    inject("resolve-alerts", gen_alert())
+
+    if pending:
+        # Phases share _bulk requests (each action line names its index), one
+        # per BULK_CHUNK_DOCS documents; the whole incident fits in one
+        with refresh_paused(es_request, es_url, api_key, sorted({index for index, _ in pending})):
+            buffer = BulkBuffer(es_url, api_key)
+            for index, docs in pending:
+                buffer.add(index, docs)
+            buffer.flush()
 
     print(f"\n{C_BOLD}{C_CYAN}{'='*60}")
     print(f"  INCIDENT INJECTED - Start the Resolve agent now!")
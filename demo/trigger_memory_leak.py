@@ -14,70 +14,57 @@ This scenario is DIFFERENT from the DB pool incident:
 Usage:
     python demo/trigger_memory_leak.py                # Inject memory leak data
     python demo/trigger_memory_leak.py --recover      # Inject recovery (after pod restart)
+    python demo/trigger_memory_leak.py --seed 42      # Same metric/log values on every run
 """
 
 import argparse
-import json
-import random
+import gzip
 import sys
 import time
-import urllib.request
-import urllib.error
-from datetime import datetime, timedelta, timezone
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 
-def load_env():
-    env_path = Path(__file__).parent.parent / ".env"
-    if not env_path.exists():
-        print("ERROR: .env file not found. Copy .env.example to .env and configure.")
-        sys.exit(1)
-    env = {}
-    with open(env_path) as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                env[key.strip()] = value.strip()
-    return env
+from es_http import send
+from es_util import (
+    add_bulk, bulk_index, format_ts, json_dumps, json_loads, load_env, now_ms, now_ts, refresh_paused,
+)
 
+GZIP_LEVEL = 1  # bulk bodies are highly repetitive; the fastest level already compresses well
 
-def es_request(url, api_key, data=None, method="POST"):
-    body = None
-    if data is not None:
-        if isinstance(data, list):
-            body = "\n".join(data) + "\n"
-        else:
-            body = json.dumps(data)
-
-    req = urllib.request.Request(
-        url,
-        data=body.encode("utf-8") if body else None,
-        headers={
-            "Authorization": f"ApiKey {api_key}",
-            "Content-Type": "application/x-ndjson" if isinstance(data, list) else "application/json",
-        },
-        method=method,
-    )
-    try:
-        with urllib.request.urlopen(req) as resp:
-            return json.loads(resp.read().decode())
-    except urllib.error.HTTPError as e:
-        print(f"  HTTP {e.code}: {e.read().decode()[:200]}")
-        return None
+# Seeded from OS entropy unless --seed is given
+rng = np.random.default_rng()
 
+ENV_PATH = Path(__file__).parent.parent / ".env"
 
-def bulk_index(es_url, api_key, index, docs):
-    lines = []
-    for doc in docs:
-        lines.append(json.dumps({"index": {"_index": index}}))
-        lines.append(json.dumps(doc))
-    return es_request(f"{es_url}/_bulk", api_key, lines)
 
+def es_request(url, api_key, data=None, method="POST"):
+    """Make an Elasticsearch API request over a reused keep-alive connection.
 
-def now_ts(offset_seconds=0):
-    dt = datetime.now(timezone.utc) + timedelta(seconds=offset_seconds)
-    return dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+    data is a JSON body (dict) or a ready-made NDJSON bulk body (bytes). Bulk
+    bodies are sent gzip-compressed.
+    """
+    parts = urllib.parse.urlsplit(url)
+    path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+    headers = {"Authorization": f"ApiKey {api_key}", "Accept-Encoding": "gzip"}
+    body = None
+    if isinstance(data, dict):
+        body = json_dumps(data)
+        headers["Content-Type"] = "application/json"
+    elif data is not None:
+        body = gzip.compress(data, compresslevel=GZIP_LEVEL)
+        headers["Content-Type"] = "application/x-ndjson"
+        headers["Content-Encoding"] = "gzip"
+
+    resp, payload = send(parts, method, path, body, headers)
+    if resp.getheader("Content-Encoding") == "gzip":
+        payload = gzip.decompress(payload)
+    if resp.status >= 400:
+        print(f"  HTTP {resp.status}: {payload.decode()[:200]}")
+        return None
+    return json_loads(payload)
 
 
 # ---------------------------------------------------------------------------
@@ -92,7 +79,7 @@ C_BOLD = "\033[1m"
 
 
 def log(color, label, message):
-    t = datetime.now().strftime("%H:%M:%S")
+    t = time.strftime("%H:%M:%S")
     print(f"  {color}[{t}] {label}{C_RESET} {message}")
 
 
@@ -100,28 +87,48 @@ def log(color, label, message):
 # Memory leak data generators
 # ---------------------------------------------------------------------------
 
+def metric_docs(ts, hosts, cpu, mem, lat, err, rps, conns):
+    """Yield one metric document per (service, host) from per-field value lists.
+
+    Every metric generator shares this constructor, so all metric documents
+    have the same keys in the same order.
+    """
+    for (service, host), c, m, lt, e, r, k in zip(hosts, cpu, mem, lat, err, rps, conns):
+        yield {
+            "@timestamp": ts,
+            "service": service, "host": host,
+            "cpu_percent": c,
+            "memory_percent": m,
+            "request_latency_ms": lt,
+            "error_rate": e,
+            "requests_per_second": r,
+            "active_connections": k,
+        }
+
+
 def gen_healthy_baseline(t_offset=0):
     """All services healthy, user-service memory normal at ~50%."""
-    docs = []
-    for service, hosts, base_mem in [
-        ("order-service", ["order-svc-01", "order-svc-02"], 48),
-        ("payment-service", ["payment-svc-01", "payment-svc-02"], 45),
-        ("notification-service", ["notif-svc-01", "notif-svc-02"], 42),
-        ("user-service", ["user-svc-01", "user-svc-02"], 50),
-        ("api-gateway", ["api-gw-01", "api-gw-02"], 40),
-    ]:
-        for host in hosts:
-            docs.append({
-                "@timestamp": now_ts(t_offset),
-                "service": service, "host": host,
-                "cpu_percent": round(random.uniform(20, 35), 1),
-                "memory_percent": round(base_mem + random.uniform(-3, 3), 1),
-                "request_latency_ms": round(random.uniform(50, 140), 1),
-                "error_rate": round(random.uniform(0.001, 0.005), 4),
-                "requests_per_second": round(random.uniform(200, 450), 1),
-                "active_connections": random.randint(80, 200),
-            })
-    return docs
+    rows = [
+        (service, host, base_mem)
+        for service, hosts, base_mem in [
+            ("order-service", ["order-svc-01", "order-svc-02"], 48),
+            ("payment-service", ["payment-svc-01", "payment-svc-02"], 45),
+            ("notification-service", ["notif-svc-01", "notif-svc-02"], 42),
+            ("user-service", ["user-svc-01", "user-svc-02"], 50),
+            ("api-gateway", ["api-gw-01", "api-gw-02"], 40),
+        ]
+        for host in hosts
+    ]
+    ts = now_ts(t_offset)
+    n = len(rows)
+    base_mem = np.array([row[2] for row in rows], dtype=np.float64)
+    cpu = rng.uniform(20, 35, n).round(1).tolist()
+    mem = (base_mem + rng.uniform(-3, 3, n)).round(1).tolist()
+    lat = rng.uniform(50, 140, n).round(1).tolist()
+    err = rng.uniform(0.001, 0.005, n).round(4).tolist()
+    rps = rng.uniform(200, 450, n).round(1).tolist()
+    conns = rng.integers(80, 201, n).tolist()
+    yield from metric_docs(ts, [(service, host) for service, host, _ in rows], cpu, mem, lat, err, rps, conns)
 
 
 def gen_memory_climbing_metrics(phase, t_offset=0):
@@ -143,45 +150,37 @@ def gen_memory_climbing_metrics(phase, t_offset=0):
     err = err_levels[phase]
     cpu = cpu_levels[phase]
 
-    docs = []
-    # user-service degrading
-    for host in ["user-svc-01", "user-svc-02"]:
-        docs.append({
-            "@timestamp": now_ts(t_offset),
-            "service": "user-service", "host": host,
-            "cpu_percent": round(cpu + random.uniform(-3, 3), 1),
-            "memory_percent": round(mem + random.uniform(-2, 2), 1),
-            "request_latency_ms": round(lat + random.uniform(-50, 100), 1),
-            "error_rate": round(err + random.uniform(-0.005, 0.01), 4),
-            "requests_per_second": round(random.uniform(150, 350), 1),
-            "active_connections": random.randint(100, 250),
-        })
-
-    # Other services healthy
-    for service, hosts in [
-        ("order-service", ["order-svc-01"]),
-        ("payment-service", ["payment-svc-01"]),
-        ("notification-service", ["notif-svc-01"]),
-        ("api-gateway", ["api-gw-01"]),
-    ]:
-        for host in hosts:
-            docs.append({
-                "@timestamp": now_ts(t_offset),
-                "service": service, "host": host,
-                "cpu_percent": round(random.uniform(22, 38), 1),
-                "memory_percent": round(random.uniform(42, 55), 1),
-                "request_latency_ms": round(random.uniform(60, 150), 1),
-                "error_rate": round(random.uniform(0.001, 0.005), 4),
-                "requests_per_second": round(random.uniform(200, 450), 1),
-                "active_connections": random.randint(90, 180),
-            })
-    return docs
+    # Per-host [low, high) bounds for cpu, mem, latency, error rate, rps and
+    # connections: user-service degrading, other services healthy
+    degraded = (cpu - 3, cpu + 3, mem - 2, mem + 2, lat - 50, lat + 100,
+                err - 0.005, err + 0.01, 150, 350, 100, 251)
+    healthy = (22, 38, 42, 55, 60, 150, 0.001, 0.005, 200, 450, 90, 181)
+    rows = [
+        ("user-service", "user-svc-01", degraded),
+        ("user-service", "user-svc-02", degraded),
+        ("order-service", "order-svc-01", healthy),
+        ("payment-service", "payment-svc-01", healthy),
+        ("notification-service", "notif-svc-01", healthy),
+        ("api-gateway", "api-gw-01", healthy),
+    ]
+    ts = now_ts(t_offset)
+    bounds = np.array([row[2] for row in rows], dtype=np.float64)
+    cpu_v = rng.uniform(bounds[:, 0], bounds[:, 1]).round(1).tolist()
+    mem_v = rng.uniform(bounds[:, 2], bounds[:, 3]).round(1).tolist()
+    lat_v = rng.uniform(bounds[:, 4], bounds[:, 5]).round(1).tolist()
+    err_v = rng.uniform(bounds[:, 6], bounds[:, 7]).round(4).tolist()
+    rps_v = rng.uniform(bounds[:, 8], bounds[:, 9]).round(1).tolist()
+    conns_v = rng.integers(bounds[:, 10].astype(np.int64), bounds[:, 11].astype(np.int64)).tolist()
+    yield from metric_docs(ts, [(service, host) for service, host, _ in rows], cpu_v, mem_v, lat_v, err_v, rps_v, conns_v)
+
+
+USER_REQUEST_PATHS = ("/api/users", "/api/users/profile", "/api/users/sessions")
 
 
 def gen_memory_leak_logs(phase, t_offset=0):
-    """Generate logs showing memory leak symptoms."""
-    docs = []
-    ts = now_ts(t_offset)
+    """Yield logs showing memory leak symptoms."""
+    # One clock read per phase; per-document jitter is added to this base
+    base = now_ms()
 
     if phase == "warning":
         logs = [
@@ -199,22 +198,26 @@ def gen_memory_leak_logs(phase, t_offset=0):
             ("warn", "Response time degraded: P99 at 3500ms (baseline: 120ms)", "LATENCY_DEGRADED"),
         ]
     else:
-        return docs
-
-    for level, msg, code in logs:
-        for host in ["user-svc-01", "user-svc-02"]:
-            doc = {
-                "@timestamp": now_ts(t_offset + random.uniform(0, 8)),
-                "level": level, "service": "user-service",
-                "message": msg, "host": host,
-                "trace_id": f"trace-mem-{random.randint(1000, 9999)}",
-                "request_path": random.choice(["/api/users", "/api/users/profile", "/api/users/sessions"]),
-                "response_time_ms": random.randint(500, 5000),
-            }
-            if code:
-                doc["error_code"] = code
-            docs.append(doc)
-    return docs
+        return
+
+    rows = [(entry, host) for entry in logs for host in ("user-svc-01", "user-svc-02")]
+    n = len(rows)
+    offsets = (t_offset + rng.uniform(0, 8, n)).tolist()
+    trace_ids = rng.integers(1000, 10000, n).tolist()
+    paths = rng.integers(0, len(USER_REQUEST_PATHS), n).tolist()
+    response_times = rng.integers(500, 5001, n).tolist()
+    for ((level, msg, code), host), offset, trace_id, path, rt in zip(rows, offsets, trace_ids, paths, response_times):
+        doc = {
+            "@timestamp": format_ts(base, offset),
+            "level": level, "service": "user-service",
+            "message": msg, "host": host,
+            "trace_id": f"trace-mem-{trace_id}",
+            "request_path": USER_REQUEST_PATHS[path],
+            "response_time_ms": rt,
+        }
+        if code:
+            doc["error_code"] = code
+        yield doc
 
 
 def gen_memory_alert(t_offset=0):
@@ -233,32 +236,30 @@ def gen_memory_alert(t_offset=0):
 
 def gen_recovery_data(t_offset=0):
     """After pod restart, memory drops back to baseline."""
-    docs = []
-    for host in ["user-svc-01", "user-svc-02"]:
-        docs.append({
-            "@timestamp": now_ts(t_offset),
-            "service": "user-service", "host": host,
-            "cpu_percent": round(random.uniform(20, 30), 1),
-            "memory_percent": round(random.uniform(35, 48), 1),
-            "request_latency_ms": round(random.uniform(60, 130), 1),
-            "error_rate": round(random.uniform(0.001, 0.005), 4),
-            "requests_per_second": round(random.uniform(250, 450), 1),
-            "active_connections": random.randint(90, 170),
-        })
-    return docs
+    hosts = ["user-svc-01", "user-svc-02"]
+    ts = now_ts(t_offset)
+    n = len(hosts)
+    cpu = rng.uniform(20, 30, n).round(1).tolist()
+    mem = rng.uniform(35, 48, n).round(1).tolist()
+    lat = rng.uniform(60, 130, n).round(1).tolist()
+    err = rng.uniform(0.001, 0.005, n).round(4).tolist()
+    rps = rng.uniform(250, 450, n).round(1).tolist()
+    conns = rng.integers(90, 171, n).tolist()
+    yield from metric_docs(ts, [("user-service", host) for host in hosts], cpu, mem, lat, err, rps, conns)
 
 
 def gen_recovery_logs(t_offset=0):
+    base = now_ms()
     return [
-        {"@timestamp": now_ts(t_offset), "level": "info", "service": "user-service",
+        {"@timestamp": format_ts(base, t_offset), "level": "info", "service": "user-service",
          "message": "Pod user-svc-01 restarted - memory reset to baseline (620MB / 2.5GB)",
          "host": "user-svc-01", "trace_id": "trace-restart-01",
          "request_path": "/healthz", "response_time_ms": 15},
-        {"@timestamp": now_ts(t_offset + 3), "level": "info", "service": "user-service",
+        {"@timestamp": format_ts(base, t_offset + 3), "level": "info", "service": "user-service",
          "message": "Pod user-svc-02 restarted - memory reset to baseline (580MB / 2.5GB)",
          "host": "user-svc-02", "trace_id": "trace-restart-02",
          "request_path": "/healthz", "response_time_ms": 12},
-        {"@timestamp": now_ts(t_offset + 8), "level": "info", "service": "user-service",
+        {"@timestamp": format_ts(base, t_offset + 8), "level": "info", "service": "user-service",
          "message": "Health check passed - all pods healthy. GC overhead resolved.",
          "host": "user-svc-01", "trace_id": "trace-restart-03",
          "request_path": "/healthz", "response_time_ms": 8},
@@ -273,9 +274,15 @@ def main():
     parser = argparse.ArgumentParser(description="Resolve - Memory Leak Incident Trigger")
     parser.add_argument("--recover", action="store_true",
                         help="Inject recovery data (after pod restart)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for the random metric and log values")
     args = parser.parse_args()
 
-    env = load_env()
+    if args.seed is not None:
+        global rng
+        rng = np.random.default_rng(args.seed)
+
+    env = load_env(ENV_PATH)
     es_url = env.get("ES_URL", "").rstrip("/")
     api_key = env.get("API_KEY", "")
 
@@ -283,18 +290,23 @@ def main():
         print("ERROR: ES_URL and API_KEY must be set in .env")
         sys.exit(1)
 
-    random.seed()
-
     if args.recover:
         print(f"\n{C_BOLD}{C_GREEN}=== Resolve: Memory Leak Recovery ==={C_RESET}\n")
 
-        log(C_GREEN, "RESTART", "Rolling restart of user-service pods...")
-        bulk_index(es_url, api_key, "resolve-logs", gen_recovery_logs())
+        # Uploads run on a background thread so each request overlaps the
+        # pause that follows it; one worker keeps them in order on a single
+        # keep-alive connection
+        with ThreadPoolExecutor(max_workers=1) as uploader:
+            log(C_GREEN, "RESTART", "Rolling restart of user-service pods...")
+            uploads = [uploader.submit(bulk_index, es_request, es_url, api_key, "resolve-logs", gen_recovery_logs())]
+
+            for i in range(3):
+                time.sleep(2)
+                uploads.append(uploader.submit(bulk_index, es_request, es_url, api_key, "resolve-metrics", gen_recovery_data(i * 60)))
+                log(C_GREEN, "METRICS", f"Recovery metrics batch {i+1}/3")
 
-        for i in range(3):
-            time.sleep(2)
-            bulk_index(es_url, api_key, "resolve-metrics", gen_recovery_data(i * 60))
-            log(C_GREEN, "METRICS", f"Recovery metrics batch {i+1}/3")
+            for upload in uploads:
+                upload.result()
 
         print(f"\n{C_BOLD}{C_GREEN}Memory leak recovery complete. Pods restarted, memory nominal.{C_RESET}\n")
         return
@@ -308,37 +320,50 @@ def main():
     print(f"  - Runbook: Memory Leak Detection (not DB Pool)")
     print(f"  - Remediation: pod restart (not rollback)\n")
 
+    # The whole timeline (~80 docs) goes up as one _bulk request at the end;
+    # the pauses between phases are only there to pace the narration. Each
+    # phase's documents are serialized into the body as they are generated.
+    body = bytearray()
+    indices = set()
+
+    def inject(index, docs):
+        add_bulk(body, index, docs)
+        indices.add(index)
+
     # Phase 1: Healthy baseline (2 hours ago)
     log(C_GREEN, "BASELINE", "Injecting healthy baseline...")
     for i in range(4):
-        bulk_index(es_url, api_key, "resolve-metrics", gen_healthy_baseline(-7200 + i * 600))
+        inject("resolve-metrics", gen_healthy_baseline(-7200 + i * 600))
     log(C_GREEN, "BASELINE", "All 5 services healthy")
     time.sleep(2)
 
     # Phase 2: Memory starts climbing (90 min ago -> 30 min ago)
     log(C_YELLOW, "MEMORY", "user-service memory starting to climb...")
-    bulk_index(es_url, api_key, "resolve-metrics", gen_memory_climbing_metrics(1, -5400))
+    inject("resolve-metrics", gen_memory_climbing_metrics(1, -5400))
     time.sleep(2)
 
     log(C_YELLOW, "MEMORY", "user-service at 78% memory - threshold breached")
-    bulk_index(es_url, api_key, "resolve-metrics", gen_memory_climbing_metrics(2, -3600))
-    bulk_index(es_url, api_key, "resolve-logs", gen_memory_leak_logs("warning", -3600))
+    inject("resolve-metrics", gen_memory_climbing_metrics(2, -3600))
+    inject("resolve-logs", gen_memory_leak_logs("warning", -3600))
     time.sleep(2)
 
     # Phase 3: Getting critical (15 min ago)
     log(C_RED, "MEMORY", "user-service at 88% - GC pauses increasing!")
-    bulk_index(es_url, api_key, "resolve-metrics", gen_memory_climbing_metrics(3, -900))
+    inject("resolve-metrics", gen_memory_climbing_metrics(3, -900))
     time.sleep(2)
 
     # Phase 4: Near OOM (now)
     log(C_RED, "CRITICAL", "user-service at 94% - OOM errors, latency spiking!")
-    bulk_index(es_url, api_key, "resolve-metrics", gen_memory_climbing_metrics(4))
-    bulk_index(es_url, api_key, "resolve-logs", gen_memory_leak_logs("critical"))
+    inject("resolve-metrics", gen_memory_climbing_metrics(4))
+    inject("resolve-logs", gen_memory_leak_logs("critical"))
     time.sleep(1)
 
     # Phase 5: Alert fires
     log(C_RED, "ALERT", "HIGH: user-service memory > 85% for 10 minutes")
-    bulk_index(es_url, api_key, "resolve-alerts", gen_memory_alert())
+    inject("resolve-alerts", gen_memory_alert())
+
+    with refresh_paused(es_request, es_url, api_key, sorted(indices)):
+        es_request(f"{es_url}/_bulk", api_key, body)
 
     print(f"\n{C_BOLD}{C_CYAN}{'='*60}")
     print(f"  MEMORY LEAK INCIDENT INJECTED")
@@ -0,0 +1,63 @@
+"""Shared settings and helpers for the docs diagram scripts."""
+import functools
+import hashlib
+import io
+import os
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.font_manager import FontProperties
+
+# Published assets stay at 200 dpi; set DOCS_DPI=120 for quick draft renders
+# (Agg cost scales with pixel count)
+DPI = int(os.environ.get('DOCS_DPI', 200))
+
+
+@functools.lru_cache(maxsize=None)
+def font(family, size, weight='normal'):
+    """Shared FontProperties per (family, size, weight) for the diagram text."""
+    return FontProperties(family=family, size=size, weight=weight)
+
+
+def new_canvas(width, height):
+    """White width x height inch figure whose axis-less axes use inches as data units."""
+    fig, ax = plt.subplots(1, 1, figsize=(width, height), facecolor='#FFFFFF',
+                           subplot_kw={'facecolor': '#FFFFFF'})
+    ax.set_xlim(0, width)
+    ax.set_ylim(0, height)
+    ax.axis('off')
+    # Fixed 0.15in margins (what tight_layout settles on for an axis-less plot),
+    # so neither a layout pass nor a tight bbox is needed at save time
+    fig.subplots_adjust(left=0.15 / width, right=1 - 0.15 / width,
+                        bottom=0.15 / height, top=1 - 0.15 / height)
+    return fig, ax
+
+
+def cached_render(script, outputs, build):
+    """Save the figure returned by build() to every path in outputs.
+
+    Output is a pure function of the script, this module and DPI; the render is
+    skipped when the .hash sidecar next to every output still matches.
+    """
+    src_hash = hashlib.sha256(
+        Path(script).read_bytes() + Path(__file__).read_bytes() + f'dpi={DPI}'.encode()
+    ).hexdigest()
+    sidecars = [Path(path).with_suffix('.hash') for path in outputs]
+    if all(Path(path).exists() and sidecar.exists() and sidecar.read_text() == src_hash
+           for path, sidecar in zip(outputs, sidecars)):
+        for path in outputs:
+            print(f"Unchanged {path}")
+        return
+
+    fig = build()
+    # Render once and write the same PNG bytes to every output
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=DPI, bbox_inches=None,
+                edgecolor='none', pil_kwargs={'compress_level': 3})
+    png = buf.getvalue()
+    for path, sidecar in zip(outputs, sidecars):
+        Path(path).write_bytes(png)
+        sidecar.write_text(src_hash)
+        print(f"Saved {path}")
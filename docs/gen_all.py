@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Generate all docs diagrams, one worker process per diagram where cores allow."""
+import multiprocessing
+import os
+import runpy
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+SCRIPTS = ('gen_architecture.py', 'gen_impact.py', 'gen_trace.py')
+
+
+def build(name):
+    # rc_context keeps one script's rcParams tweaks from leaking into the next
+    with plt.rc_context():
+        runpy.run_path(str(Path(__file__).parent / name), run_name='__main__')
+    # Free each figure before building the next so one renderer lives at a time
+    plt.close('all')
+
+
+if __name__ == '__main__':
+    # Agg renders on one core per figure, so the diagrams are built side by side.
+    # matplotlib is imported above, before the pool starts; workers are forked
+    # where the platform allows so they inherit it instead of importing it
+    # again (spawn and forkserver start clean). On a single core the pool
+    # would only add overhead
+    workers = min(len(SCRIPTS), os.cpu_count() or 1)
+    if workers == 1:
+        for name in SCRIPTS:
+            build(name)
+    else:
+        fork = 'fork' in multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context('fork') if fork else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            list(pool.map(build, SCRIPTS))
@@ -2,15 +2,11 @@
 """Generate impact comparison chart - clean white background."""
 import matplotlib
 matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import PatchCollection
 from matplotlib.patches import FancyBboxPatch
 
-fig, ax = plt.subplots(1, 1, figsize=(16, 8))
-fig.patch.set_facecolor('#FFFFFF')
-ax.set_facecolor('#FFFFFF')
-ax.set_xlim(0, 16)
-ax.set_ylim(0, 8)
-ax.axis('off')
+from _common import cached_render, font, new_canvas
 
 # ---------------------------------------------------------------------------
 # Palette
@@ -27,97 +23,126 @@ GREEN_BG = '#ECFDF5'
 TEAL = '#0D9488'
 BLUE = '#2563EB'
 
-def draw_box(x, y, w, h, facecolor, edgecolor, lw=1.5, rad=0.1):
-    rect = FancyBboxPatch(
-        (x, y), w, h, boxstyle=f"round,pad={rad}",
-        facecolor=facecolor, edgecolor=edgecolor, linewidth=lw, zorder=2
-    )
-    ax.add_patch(rect)
-
-# ---------------------------------------------------------------------------
-# Title
-# ---------------------------------------------------------------------------
-ax.text(8, 7.5, 'RESOLVE: MEASURABLE IMPACT', ha='center', va='center',
-        fontsize=24, fontweight='bold', color=DARK, fontfamily='sans-serif')
-ax.text(8, 7.05, 'Before vs After  --  Manual Incident Response vs Resolve Agent',
-        ha='center', va='center', fontsize=10, color=GRAY_500, fontfamily='sans-serif')
-
-# ---------------------------------------------------------------------------
-# Column Headers
-# ---------------------------------------------------------------------------
-# Metric column
-ax.text(4.2, 6.35, 'METRIC', ha='center', va='center',
-        fontsize=10, fontweight='bold', color=GRAY_500, fontfamily='sans-serif')
-
-# Before column
-draw_box(6.5, 6.1, 3.5, 0.55, facecolor=RED_BG, edgecolor=RED, lw=1.5, rad=0.08)
-ax.text(8.25, 6.37, 'BEFORE (Manual)', ha='center', va='center',
-        fontsize=11, fontweight='bold', color=RED, fontfamily='sans-serif')
-
-# After column
-draw_box(10.3, 6.1, 3.5, 0.55, facecolor=GREEN_BG, edgecolor=GREEN, lw=1.5, rad=0.08)
-ax.text(12.05, 6.37, 'AFTER (Resolve)', ha='center', va='center',
-        fontsize=11, fontweight='bold', color=GREEN, fontfamily='sans-serif')
-
-# Improvement column
-ax.text(14.8, 6.35, 'GAIN', ha='center', va='center',
-        fontsize=10, fontweight='bold', color=GRAY_500, fontfamily='sans-serif')
-
-# ---------------------------------------------------------------------------
-# Separator line under headers
-# ---------------------------------------------------------------------------
-ax.plot([1.2, 14.8], [5.95, 5.95], color=GRAY_300, linewidth=1.2, zorder=3)
-
 # ---------------------------------------------------------------------------
-# Metrics rows
+# Data
 # ---------------------------------------------------------------------------
-metrics = [
+# (metric, before, after, gain)
+METRICS = (
     ('Mean Time To Resolution', '45 minutes', '< 5 minutes', '90% faster'),
     ('Steps to Diagnose', '8-12 manual steps', '6 automated steps', 'Autonomous'),
     ('Services Correlated', '1-2 (human limit)', 'All 5 simultaneously', '3x coverage'),
     ('Runbook Search Time', '5-10 minutes', '< 10 seconds', 'Semantic'),
-    ('Data Sources Queried', '1-2 dashboards', '4 indices, 4,098 docs', 'Complete'),
+    ('Data Sources Queried', '1-2 dashboards', '4 indices, 4,101 docs', 'Complete'),
     ('On-Call Notification', '5+ min (manual page)', 'Instant (workflow)', 'Automated'),
-]
-
-for i, (metric, before, after, gain) in enumerate(metrics):
-    y = 5.45 - i * 0.82
-
-    # Alternating row background
-    if i % 2 == 0:
+)
+
+OUTPUTS = ('docs/screenshots/10-impact.png',)
+
+
+def draw():
+    """Build the diagram and return its figure."""
+    fig, ax = new_canvas(16, 8)
+
+    # Boxes are collected here and added to the axes as one PatchCollection at the
+    # end, in draw order, rather than as separate patch artists
+    boxes = []
+
+    def draw_box(x, y, w, h, facecolor, edgecolor, lw=1.5, rad=0.1):
+        boxes.append(FancyBboxPatch(
+            (x, y), w, h, boxstyle=f"round,pad={rad}",
+            facecolor=facecolor, edgecolor=edgecolor, linewidth=lw
+        ))
+
+    # -----------------------------------------------------------------------
+    # Title
+    # -----------------------------------------------------------------------
+    ax.text(8, 7.5, 'RESOLVE: MEASURABLE IMPACT', ha='center', va='center',
+            fontsize=24, fontweight='bold', color=DARK, fontfamily='sans-serif')
+    ax.text(8, 7.05, 'Before vs After  --  Manual Incident Response vs Resolve Agent',
+            ha='center', va='center', fontsize=10, color=GRAY_500, fontfamily='sans-serif')
+
+    # -----------------------------------------------------------------------
+    # Column Headers
+    # -----------------------------------------------------------------------
+    # Metric column
+    ax.text(4.2, 6.35, 'METRIC', ha='center', va='center',
+            fontsize=10, fontweight='bold', color=GRAY_500, fontfamily='sans-serif')
+
+    # Before column
+    draw_box(6.5, 6.1, 3.5, 0.55, facecolor=RED_BG, edgecolor=RED, lw=1.5, rad=0.08)
+    ax.text(8.25, 6.37, 'BEFORE (Manual)', ha='center', va='center',
+            fontsize=11, fontweight='bold', color=RED, fontfamily='sans-serif')
+
+    # After column
+    draw_box(10.3, 6.1, 3.5, 0.55, facecolor=GREEN_BG, edgecolor=GREEN, lw=1.5, rad=0.08)
+    ax.text(12.05, 6.37, 'AFTER (Resolve)', ha='center', va='center',
+            fontsize=11, fontweight='bold', color=GREEN, fontfamily='sans-serif')
+
+    # Improvement column
+    ax.text(14.8, 6.35, 'GAIN', ha='center', va='center',
+            fontsize=10, fontweight='bold', color=GRAY_500, fontfamily='sans-serif')
+
+    # -----------------------------------------------------------------------
+    # Separator line under headers
+    # -----------------------------------------------------------------------
+    ax.plot([1.2, 14.8], [5.95, 5.95], color=GRAY_300, linewidth=1.2, zorder=3)
+
+    # -----------------------------------------------------------------------
+    # Metrics rows
+    # -----------------------------------------------------------------------
+    # Row centres for every metric, top to bottom
+    ys = 5.45 - np.arange(len(METRICS)) * 0.82
+    metric_col, before_col, after_col, gain_col = zip(*METRICS)
+
+    # Alternating row backgrounds
+    for y in ys[::2]:
         draw_box(1.0, y - 0.32, 13.9, 0.72, facecolor=GRAY_100, edgecolor=GRAY_100, lw=0, rad=0.06)
 
+    # Gain badges
+    for y in ys:
+        draw_box(14.0, y - 0.18, 1.6, 0.36, facecolor=GREEN_BG, edgecolor=GREEN, lw=1, rad=0.06)
+
     # Metric name
-    ax.text(1.3, y, metric, ha='left', va='center',
-            fontsize=10, fontweight='bold', color=DARK, fontfamily='sans-serif')
+    for y, metric in zip(ys, metric_col):
+        ax.text(1.3, y, metric, ha='left', va='center',
+                color=DARK, fontproperties=font('sans-serif', 10, 'bold'))
 
     # Before value
-    ax.text(8.25, y, before, ha='center', va='center',
-            fontsize=10.5, color=RED, fontfamily='monospace', fontweight='bold')
+    for y, before in zip(ys, before_col):
+        ax.text(8.25, y, before, ha='center', va='center',
+                color=RED, fontproperties=font('monospace', 10.5, 'bold'))
 
     # After value
-    ax.text(12.05, y, after, ha='center', va='center',
-            fontsize=10.5, color=GREEN, fontfamily='monospace', fontweight='bold')
+    for y, after in zip(ys, after_col):
+        ax.text(12.05, y, after, ha='center', va='center',
+                color=GREEN, fontproperties=font('monospace', 10.5, 'bold'))
 
-    # Gain badge
-    draw_box(14.0, y - 0.18, 1.6, 0.36, facecolor=GREEN_BG, edgecolor=GREEN, lw=1, rad=0.06)
-    ax.text(14.8, y, gain, ha='center', va='center',
-            fontsize=8.5, fontweight='bold', color=GREEN, fontfamily='sans-serif')
+    # Gain label
+    for y, gain in zip(ys, gain_col):
+        ax.text(14.8, y, gain, ha='center', va='center',
+                color=GREEN, fontproperties=font('sans-serif', 8.5, 'bold'))
 
-    # Row separator
-    if i < len(metrics) - 1:
-        ax.plot([1.2, 14.8], [y - 0.41, y - 0.41], color=GRAY_300, linewidth=0.5, zorder=3)
+    # Row separators as one LineCollection (projecting caps to match ax.plot)
+    ax.hlines(ys[:-1] - 0.41, 1.2, 14.8, color=GRAY_300, linewidth=0.5,
+              capstyle='projecting', zorder=3)
 
-# ---------------------------------------------------------------------------
-# Bottom tagline
-# ---------------------------------------------------------------------------
-ax.text(8, 0.45, 'Built with Elastic Agent Builder  |  ES|QL + ELSER + Workflows  |  8 Tools  |  6 Indices',
-        ha='center', va='center', fontsize=9, color=GRAY_500, fontfamily='sans-serif')
+    # -----------------------------------------------------------------------
+    # Bottom tagline
+    # -----------------------------------------------------------------------
+    ax.text(8, 0.45, 'Built with Elastic Agent Builder  |  ES|QL + ELSER + Workflows  |  8 Tools  |  6 Indices',
+            ha='center', va='center', fontsize=9, color=GRAY_500, fontfamily='sans-serif')
 
-# ---------------------------------------------------------------------------
-# Save
-# ---------------------------------------------------------------------------
-plt.tight_layout()
-plt.savefig('docs/screenshots/10-impact.png', dpi=200, bbox_inches='tight',
-            facecolor='#FFFFFF', edgecolor='none')
-print("Saved docs/screenshots/10-impact.png")
+    # -----------------------------------------------------------------------
+    # Boxes
+    # -----------------------------------------------------------------------
+    ax.add_collection(PatchCollection(boxes, match_original=True, zorder=2))
+
+    return fig
+
+
+def main():
+    cached_render(__file__, OUTPUTS, draw)
+
+
+if __name__ == '__main__':
+    main()
@@ -78,4 +78,5 @@ echo "  2. Try: 'There is a critical alert on order-service. Error rates are spi
 echo "  3. Watch the agent investigate using the 6-step protocol"
 echo ""
 echo "For a live demo, run:"
+echo "  pip install -r demo/requirements.txt"
 echo "  python demo/trigger_incident.py --mode realtime"